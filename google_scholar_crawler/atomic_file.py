@@ -0,0 +1,57 @@
+"""Atomic replacement of the files the crawler writes"""
+
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, Union
+
+
+def _fsync_directory(directory: str) -> None:
+    # Makes the rename itself durable; not every platform can open a directory
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w") -> Iterator[IO]:
+    """Open a temporary file that replaces ``path`` once the block completes
+
+    The data and the rename are on disk once the block completes, so
+    readers (and the next run after a crash) see either the old file or
+    the complete new one. If the block raises, ``path`` is left
+    untouched. Missing parent directories are created; text is written
+    as UTF-8. ``scripts/sync_resume.py`` mirrors this in
+    ``write_file_atomic``.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    encoding = None if "b" in mode else "utf-8"
+    try:
+        with open(tmp_path, mode, encoding=encoding) as outfile:
+            yield outfile
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def write_atomic(path: str, data: Union[str, bytes]) -> int:
+    """Atomically replace ``path`` with ``data``; returns its length"""
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w") as outfile:
+        outfile.write(data)
+    return len(data)
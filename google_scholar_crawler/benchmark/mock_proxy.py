@@ -0,0 +1,174 @@
+"""Local stand-in for an egress proxy, used to exercise the proxy pool
+
+A forward HTTP proxy that relays plain-HTTP requests (such as those to
+``mock_scholar.py``) and can misbehave: add latency, fail with 502,
+answer with a CAPTCHA page as if its IP were flagged, or be down
+altogether. Run a few next to the mock server::
+
+    python benchmark/mock_scholar.py --port 8000
+    python benchmark/mock_proxy.py --port 8101
+    python benchmark/mock_proxy.py --port 8102 --captcha 0.5
+    SCHOLAR_ORIGIN=http://127.0.0.1:8000 GOOGLE_SCHOLAR_ID=mock-100 \\
+    SCHOLAR_PROXIES=http://127.0.0.1:8101,http://127.0.0.1:8102 python main.py
+"""
+
+import argparse
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mock_scholar import CAPTCHA_PAGE
+
+# Relay without any proxy from the environment
+_OPENER = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "content-length"}
+
+
+class MockProxy:
+    """Threaded forward proxy with injectable faults
+
+    ``latency`` seconds are added to every request; a request fails with
+    a 502 with probability ``failure`` and is answered with a CAPTCHA
+    page with probability ``captcha``. A proxy that is ``down`` drops
+    every connection. ``stats`` counts outcomes.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        failure: float = 0.0,
+        captcha: float = 0.0,
+        down: bool = False,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.failure = failure
+        self.captcha = captcha
+        self.down = down
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                proxy._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _reply(self, handler, status: int, body: bytes, headers=()) -> None:
+        handler.send_response(status)
+        for name, value in headers:
+            if name.lower() not in _HOP_HEADERS:
+                handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        if self.down:
+            self._count("dropped")
+            handler.close_connection = True
+            return
+        if self.latency:
+            time.sleep(self.latency)
+
+        draw = self._draw()
+        if draw < self.failure:
+            self._count("failed")
+            self._reply(handler, 502, b"Bad gateway")
+            return
+        if draw < self.failure + self.captcha:
+            self._count("captcha")
+            self._reply(handler, 200, CAPTCHA_PAGE.encode(), [("Content-Type", "text/html")])
+            return
+
+        request = urllib.request.Request(
+            handler.path,
+            headers={k: v for k, v in handler.headers.items() if k.lower() not in _HOP_HEADERS},
+        )
+        try:
+            with _OPENER.open(request, timeout=30) as upstream:
+                status, headers, body = upstream.status, upstream.getheaders(), upstream.read()
+        except urllib.error.HTTPError as e:
+            status, headers, body = e.code, e.headers.items(), e.read()
+        except OSError:
+            self._count("failed")
+            self._reply(handler, 502, b"Bad gateway")
+            return
+        self._count("relayed")
+        self._reply(handler, status, body, headers)
+
+    def start(self) -> "MockProxy":
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relay HTTP requests with injectable faults")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--failure", type=float, default=0.0, help="Probability of a 502")
+    parser.add_argument("--captcha", type=float, default=0.0, help="Probability of a CAPTCHA page")
+    parser.add_argument("--down", action="store_true", help="Drop every connection")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the injected faults")
+    args = parser.parse_args(argv)
+
+    proxy = MockProxy(
+        args.host,
+        args.port,
+        latency=args.latency,
+        failure=args.failure,
+        captcha=args.captcha,
+        down=args.down,
+        seed=args.seed,
+    )
+    print(f"🧪 Mock proxy on {proxy.url}")
+    try:
+        proxy.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.server.server_close()
+        print(f"🧪 Proxied: {dict(proxy.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Local stand-in for Google Scholar used by the crawler benchmark
+
+Serves synthetic author profiles and publication pages with the markup
+scholarly parses, so the crawler can run end to end without touching
+the network. A profile is addressed by its scholar ID ``mock-<N>`` and
+has N publications. Latency, 429 responses and CAPTCHA pages can be
+injected to exercise the retry and rate-limiting paths.
+
+Run it on its own and point the crawler at it::
+
+    python benchmark/mock_scholar.py --port 8000 --captcha 0.01
+    SCHOLAR_ORIGIN=http://127.0.0.1:8000 GOOGLE_SCHOLAR_ID=mock-100 python main.py
+"""
+
+import argparse
+import random
+import re
+import threading
+import time
+from collections import Counter
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+PROFILE_RE = re.compile(r"^mock-(\d+)$")
+YEARS = range(2016, 2026)
+
+CAPTCHA_PAGE = (
+    "<html><body><h1>Please show you're not a robot</h1>"
+    '<form id="captcha-form" method="post"><div id="recaptcha"></div></form>'
+    "</body></html>"
+)
+
+
+def profile_size(scholar_id: str) -> Optional[int]:
+    """Number of publications of a mock profile, None if the ID is unknown"""
+    match = PROFILE_RE.match(scholar_id or "")
+    return int(match.group(1)) if match else None
+
+
+def pub_id(scholar_id: str, index: int) -> str:
+    return f"{scholar_id}:P{index:06d}"
+
+
+def num_citations(index: int) -> int:
+    """Deterministic, roughly Zipf-like citation count of the ``index``-th paper"""
+    return 1000 // (index + 1) + (index * 7) % 5
+
+
+def _yearly(total: int):
+    """Spread ``total`` citations over the last years"""
+    share, rest = divmod(total, len(YEARS))
+    return [(year, share + (1 if i < rest else 0)) for i, year in enumerate(YEARS)]
+
+
+def render_profile(scholar_id: str, size: int, start: int = 0, pagesize: int = 20) -> str:
+    """One page of a profile listing, with the summary sections"""
+    citedby = sum(num_citations(i) for i in range(size))
+    counts = sorted((num_citations(i) for i in range(size)), reverse=True)
+    hindex = sum(1 for rank, n in enumerate(counts, start=1) if n >= rank)
+    i10 = sum(1 for n in counts if n >= 10)
+
+    parts = [
+        "<html><body>",
+        f'<div id="gsc_prf_in">Mock Author {size}</div>',
+        '<img id="gsc_prf_pup-img" src="/citations/images/avatar_scholar_128.png">',
+        '<div class="gsc_prf_il">Benchmark University</div>',
+        '<div class="gsc_prf_il" id="gsc_prf_int">'
+        '<a class="gsc_prf_inta" href="#">Benchmarking</a>'
+        '<a class="gsc_prf_inta" href="#">Web Crawling</a></div>',
+        '<div class="gsc_prf_il" id="gsc_prf_ivh">Verified email at example.edu</div>',
+        '<table id="gsc_rsb_st"><tbody>',
+    ]
+    for value, value5y in ((citedby, citedby // 2), (hindex, hindex), (i10, i10)):
+        parts.append(
+            f'<tr><td class="gsc_rsb_std">{value}</td><td class="gsc_rsb_std">{value5y}</td></tr>'
+        )
+    parts.append("</tbody></table>")
+    for year, count in _yearly(citedby):
+        parts.append(f'<span class="gsc_g_t">{year}</span><span class="gsc_g_al">{count}</span>')
+
+    parts.append('<table id="gsc_a_t"><tbody id="gsc_a_b">')
+    end = min(size, start + pagesize)
+    for index in range(start, end):
+        cites = num_citations(index)
+        view = (
+            f"/citations?view_op=view_citation&amp;hl=en&amp;user={scholar_id}"
+            f"&amp;citation_for_view={pub_id(scholar_id, index)}"
+        )
+        cited_by = (
+            f'<a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;cites={index + 1}"'
+            f' class="gsc_a_ac gs_ibl">{cites}</a>'
+            if cites
+            else '<a class="gsc_a_ac gs_ibl"></a>'
+        )
+        parts.append(
+            '<tr class="gsc_a_tr">'
+            f'<td class="gsc_a_t"><a href="{view}" class="gsc_a_at">Synthetic Paper {index}</a>'
+            '<div class="gs_gray">A. Author, B. Author</div></td>'
+            f'<td class="gsc_a_c">{cited_by}</td>'
+            f'<td class="gsc_a_y"><span class="gsc_a_h gsc_a_hc gs_ibl">{YEARS[index % len(YEARS)]}</span></td>'
+            "</tr>"
+        )
+    parts.append("</tbody></table>")
+    disabled = ' disabled=""' if end >= size else ""
+    parts.append(f'<button type="button" id="gsc_bpf_more"{disabled}>Show more</button>')
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def render_publication(scholar_id: str, index: int) -> str:
+    """Detail page of one publication"""
+    cites = num_citations(index)
+    year = YEARS[index % len(YEARS)]
+    fields = [
+        ("Authors", "A. Author, B. Author, C. Author"),
+        ("Publication date", f"{year}/5/1"),
+        ("Journal", "Journal of Synthetic Benchmarks"),
+        ("Volume", str(index % 40 + 1)),
+        ("Pages", f"{index}-{index + 12}"),
+        ("Publisher", "Mock Press"),
+        (
+            "Description",
+            '<div class="gsh_csp">'
+            + escape(f"Abstract of synthetic paper {index}. " * 20)
+            + "</div>",
+        ),
+    ]
+    if cites:
+        fields.append(
+            (
+                "Total citations",
+                f'<a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;cites={index + 1}">'
+                f"Cited by {cites}</a>",
+            )
+        )
+
+    parts = [
+        "<html><body>",
+        f'<div id="gsc_oci_title"><a class="gsc_oci_title_link" '
+        f'href="https://example.org/paper/{index}">Synthetic Paper {index}</a></div>',
+        '<div id="gsc_oci_table">',
+    ]
+    for field, value in fields:
+        parts.append(
+            f'<div class="gs_scl"><div class="gsc_oci_field">{field}</div>'
+            f'<div class="gsc_oci_value">{value}</div></div>'
+        )
+    parts.append("</div>")
+    for year, count in _yearly(cites):
+        parts.append(f'<span class="gsc_oci_g_t">{year}</span>')
+        if count:
+            parts.append(
+                f'<a class="gsc_oci_g_a" href="/scholar?as_ylo={year}&amp;as_yhi={year}">'
+                f'<span class="gsc_oci_g_al">{count}</span></a>'
+            )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+class MockScholar:
+    """Threaded HTTP server answering like Google Scholar
+
+    ``latency`` seconds (plus up to ``jitter``) are added to every
+    response; each request is answered with a 429 with probability
+    ``rate_limit`` and with a CAPTCHA page with probability ``captcha``.
+    ``stats`` counts served pages by kind.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        captcha: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.captcha = captcha
+        self.retry_after = retry_after
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                mock._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def origin(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self):
+        with self._lock:
+            return (
+                self._random.random(),
+                self._random.random(),
+                self._random.uniform(0, self.jitter),
+            )
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _route(self, path: str, query: dict):
+        """Return ``(kind, status, body)`` for a request"""
+        if path != "/citations":
+            return "unknown", 404, "<html><body>Not found</body></html>"
+
+        def first(name, default=None):
+            return query.get(name, [default])[0]
+
+        if first("view_op") == "view_citation":
+            scholar_id, _, index = (first("citation_for_view") or "").partition(":P")
+            size = profile_size(scholar_id)
+            if size is None or not index.isdigit() or int(index) >= size:
+                return "unknown", 404, "<html><body>Not found</body></html>"
+            return "publication", 200, render_publication(scholar_id, int(index))
+
+        scholar_id = first("user")
+        size = profile_size(scholar_id)
+        if size is None:
+            return "unknown", 404, "<html><body>Not found</body></html>"
+        start = int(first("cstart", "0"))
+        pagesize = int(first("pagesize", "20"))
+        return "profile", 200, render_profile(scholar_id, size, start, pagesize)
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        url = urlsplit(handler.path)
+        throttle_draw, captcha_draw, extra = self._draw()
+        if self.latency or extra:
+            time.sleep(self.latency + extra)
+
+        headers = {}
+        if throttle_draw < self.rate_limit:
+            kind, status, body = "rate_limited", 429, "<html><body>Too many requests</body></html>"
+            headers["Retry-After"] = f"{self.retry_after:g}"
+        elif captcha_draw < self.captcha:
+            kind, status, body = "captcha", 200, CAPTCHA_PAGE
+        else:
+            kind, status, body = self._route(url.path, parse_qs(url.query))
+        self._count(kind)
+
+        data = body.encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=UTF-8")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def start(self) -> "MockScholar":
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def add_injection_args(parser: argparse.ArgumentParser) -> None:
+    """Options shared by this server and the benchmark runner"""
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many more seconds at random")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probability of answering 429")
+    parser.add_argument("--captcha", type=float, default=0.0, help="Probability of a CAPTCHA page")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with a 429")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the injected failures")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve mock Google Scholar pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_injection_args(parser)
+    args = parser.parse_args(argv)
+
+    mock = MockScholar(
+        args.host,
+        args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        captcha=args.captcha,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"🧪 Mock Google Scholar on {mock.origin} (profiles: mock-<N>)")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+        print(f"🧪 Served: {dict(mock.stats)}")
+
+
+if __name__ == "__main__":
+    main()
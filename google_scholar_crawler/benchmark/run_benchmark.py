@@ -0,0 +1,243 @@
+"""Offline benchmark of the crawler against the mock Google Scholar server
+
+Each profile size is crawled by the real ``crawl_author`` in a fresh
+subprocess (so peak RSS is per profile) with all Google Scholar
+requests routed to a local ``MockScholar``. Reports wall time,
+requests/s and peak RSS per profile::
+
+    python benchmark/run_benchmark.py --sizes 10 100 1000 --rate-limit 0.02
+    python benchmark/run_benchmark.py --sizes 100 --proxies 4 --bad-proxies 1
+
+scholarly waits 1-2 seconds before every request; ``--jitter-scale``
+scales those waits (0 by default, so the crawler's own overhead is
+measured; 1 reproduces production pacing).
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CRAWLER_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from mock_proxy import MockProxy  # noqa: E402
+from mock_scholar import MockScholar, add_injection_args  # noqa: E402
+
+
+class _ScaledRandom(random.Random):
+    """``random`` replacement for scholarly that shortens its sleeps"""
+
+    def __init__(self, scale: float):
+        super().__init__()
+        self.scale = scale
+
+    def uniform(self, a, b):
+        return super().uniform(a, b) * self.scale
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _counter(snapshot: dict, name: str, **labels) -> float:
+    return sum(
+        c["value"]
+        for c in snapshot["counters"]
+        if c["name"] == name and all(c["labels"].get(k) == v for k, v in labels.items())
+    )
+
+
+def _histogram(snapshot: dict, name: str) -> Optional[dict]:
+    for entry in snapshot["histograms"]:
+        if entry["name"] == name:
+            return entry
+    return None
+
+
+def run_worker(args) -> None:
+    """Crawl one mock profile in this process and write its report"""
+    sys.path.insert(0, CRAWLER_DIR)
+    os.chdir(args.workdir)
+    import scholarly._navigator
+
+    import main as crawler
+    from metrics import METRICS
+    from rate_limiter import RateLimiter
+
+    scholarly._navigator.random = _ScaledRandom(args.jitter_scale)
+    limiter = RateLimiter(args.rate, max_concurrency=args.max_per_host, max_rate=args.max_rate)
+    proxies = crawler.build_proxy_pool(args, limiter)
+    crawler.configure_scholarly_session(limiter, proxies)
+    METRICS.reset()
+
+    start = time.perf_counter()
+    ok = crawler.crawl_author(args.scholar_id, crawler.RESULTS_DIR)
+    wall = time.perf_counter() - start
+
+    snapshot = METRICS.snapshot()
+    with open(os.path.join(crawler.RESULTS_DIR, crawler.GS_DATA_FILE), "r") as infile:
+        publications = len(json.load(infile).get("publications", {}))
+    fill = _histogram(snapshot, "scholar_publication_fill_seconds")
+    requests = _counter(snapshot, "scholar_requests_total")
+    report = {
+        "scholar_id": args.scholar_id,
+        "ok": ok,
+        "publications": publications,
+        "wall_seconds": wall,
+        "requests": requests,
+        "requests_per_second": requests / wall if wall else None,
+        "throttled": _counter(snapshot, "scholar_throttled_total"),
+        "errors": _counter(snapshot, "scholar_request_errors_total"),
+        "fill_p50": fill["p50"] if fill else None,
+        "fill_p95": fill["p95"] if fill else None,
+        "final_rate": limiter.rate,
+        "peak_rss_mb": _peak_rss_mb(),
+        "proxies": proxies.snapshot() if proxies else None,
+    }
+    with open(args.report, "w") as outfile:
+        json.dump(report, outfile)
+
+
+def run_profile(size: int, origin: str, proxy_urls, args) -> dict:
+    """Crawl the ``mock-<size>`` profile in a subprocess and return its report"""
+    with tempfile.TemporaryDirectory(prefix="gs-bench-") as workdir:
+        report_path = os.path.join(workdir, "report.json")
+        env = dict(
+            os.environ,
+            SCHOLAR_ORIGIN=origin,
+            SCHOLAR_TIMEOUT=str(args.timeout),
+            SCHOLAR_CACHE="true" if args.cache else "false",
+            SCHOLAR_CACHE_FILE=os.path.join(workdir, "scholar_http.sqlite"),
+            SCHOLAR_FILL_CONCURRENCY=str(args.fill_concurrency),
+            # Deep-fill every publication, the crawl's most request-heavy mode
+            SCHOLAR_INCREMENTAL="true",
+            SCHOLAR_PROXIES=",".join(proxy_urls),
+        )
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--worker",
+            f"mock-{size}",
+            "--workdir",
+            workdir,
+            "--report",
+            report_path,
+            "--rate",
+            str(args.rate),
+            "--max-rate",
+            str(args.max_rate),
+            "--jitter-scale",
+            str(args.jitter_scale),
+            "--max-per-host",
+            str(args.max_per_host),
+        ]
+        output = None if args.verbose else subprocess.DEVNULL
+        result = subprocess.run(command, env=env, stdout=output, stderr=output)
+        if result.returncode != 0:
+            return {"scholar_id": f"mock-{size}", "ok": False, "returncode": result.returncode}
+        with open(report_path, "r") as infile:
+            return json.load(infile)
+
+
+def _fmt(value, spec: str) -> str:
+    return "n/a" if value is None else format(value, spec)
+
+
+def print_table(reports) -> None:
+    header = f"{'profile':>12} {'pubs':>6} {'wall s':>8} {'reqs':>6} {'req/s':>7} {'429/captcha':>11} {'fill p95':>9} {'RSS MB':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in reports:
+        if "wall_seconds" not in r:
+            print(f"{r['scholar_id']:>12} failed (exit code {r.get('returncode')})")
+            continue
+        print(
+            f"{r['scholar_id']:>12} {r['publications']:>6} {r['wall_seconds']:>8.2f} "
+            f"{r['requests']:>6.0f} {_fmt(r['requests_per_second'], '.1f'):>7} "
+            f"{r['throttled']:>11.0f} {_fmt(r['fill_p95'], '.3f'):>9} {r['peak_rss_mb']:>7.1f}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the crawler against a mock Google Scholar")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Publications per profile")
+    parser.add_argument("--rate", type=float, default=20.0, help="Initial requests per second")
+    parser.add_argument("--max-rate", type=float, default=50.0, help="Upper bound of the adaptive rate")
+    parser.add_argument("--jitter-scale", type=float, default=0.0, help="Scale of scholarly's 1-2 s waits")
+    parser.add_argument("--max-per-host", type=int, default=2, help="Maximum concurrent requests")
+    parser.add_argument("--fill-concurrency", type=int, default=4, help="Publications filled concurrently")
+    parser.add_argument("--timeout", type=int, default=600, help="Time budget per crawl attempt")
+    parser.add_argument("--cache", action="store_true", help="Enable the page cache (cold, per profile)")
+    parser.add_argument("--proxies", type=int, default=0, help="Route requests over this many mock proxies")
+    parser.add_argument("--bad-proxies", type=int, default=0, help="Mock proxies answering only CAPTCHAs")
+    parser.add_argument("--output", help="Also write the reports as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the crawler's output")
+    add_injection_args(parser)
+    # Internal: crawl a single profile in this process
+    parser.add_argument("--worker", dest="scholar_id", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--report", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.scholar_id:
+        run_worker(args)
+        return
+
+    mock = MockScholar(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        captcha=args.captcha,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ).start()
+    print(f"🧪 Mock Google Scholar on {mock.origin}")
+    proxies = [
+        MockProxy(captcha=1.0 if i < args.bad_proxies else 0.0, seed=args.seed).start()
+        for i in range(max(args.proxies, args.bad_proxies))
+    ]
+    if proxies:
+        print(f"🧪 {len(proxies)} mock proxies, {args.bad_proxies} of them bad")
+    reports = []
+    try:
+        for size in args.sizes:
+            print(f"🧪 Crawling mock-{size}...")
+            reports.append(run_profile(size, mock.origin, [p.url for p in proxies], args))
+    finally:
+        mock.stop()
+        for proxy in proxies:
+            proxy.stop()
+
+    print()
+    print_table(reports)
+    print(f"\n🧪 Served: {dict(mock.stats)}")
+    for proxy in proxies:
+        print(f"🧪 Proxied by {proxy.url}: {dict(proxy.stats)}")
+    if args.output:
+        with open(args.output, "w") as outfile:
+            json.dump(
+                {
+                    "served": dict(mock.stats),
+                    "proxied": {proxy.url: dict(proxy.stats) for proxy in proxies},
+                    "profiles": reports,
+                },
+                outfile,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
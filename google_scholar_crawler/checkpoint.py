@@ -0,0 +1,158 @@
+"""Append-only checkpoint of crawl progress"""
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from atomic_file import atomic_open
+
+CHECKPOINT_MAX_AGE = 12 * 60 * 60  # Older checkpoints belong to an abandoned run
+
+
+def _stub(pub: dict) -> dict:
+    """Stand-in kept in memory for a publication whose data is on disk"""
+    return {
+        "author_pub_id": pub["author_pub_id"],
+        "num_citations": pub.get("num_citations"),
+        "filled": True,
+        "checkpointed": True,
+    }
+
+
+class Checkpoint:
+    """JSONL log that every filled publication is streamed to as it arrives
+
+    The log holds ``author`` records (profile data and the publication
+    listing, written once the summary sections are filled) and one
+    ``publication`` record per deep-filled or reused publication. Filled
+    publications are swapped for small stubs in memory, so a crash loses
+    at most the publication being fetched and the full data only ever
+    exists on disk. ``compact`` turns the log into the final keyed
+    ``gs_data.json``.
+    """
+
+    def __init__(self, path: str, max_age: float = CHECKPOINT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+
+    def _append(self, kind: str, data: dict) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as outfile:
+            record = {"type": kind, "time": time.time(), "data": data}
+            outfile.write(json.dumps(record, ensure_ascii=False) + "\n")
+            outfile.flush()
+
+    def record_author(self, author: dict) -> None:
+        """Checkpoint the profile data and publication listing"""
+        self._append("author", author)
+
+    def record_publication(self, pub: dict) -> dict:
+        """Checkpoint a filled publication and return the stub that replaces it"""
+        self._append("publication", pub)
+        return _stub(pub)
+
+    def _scan(self):
+        """Offsets of the last author record and of each publication record"""
+        author_offset = None
+        started = None
+        publications: Dict[str, int] = {}
+        try:
+            infile = open(self.path, "rb")
+        except OSError:
+            return None, None, publications
+        with infile:
+            offset = 0
+            for line in infile:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write
+                    break
+                if started is None:
+                    started = record.get("time")
+                if record["type"] == "author":
+                    author_offset = offset
+                elif record["type"] == "publication":
+                    publications[record["data"]["author_pub_id"]] = offset
+                offset += len(line)
+        return started, author_offset, publications
+
+    def _read(self, infile, offset: int) -> dict:
+        infile.seek(offset)
+        return json.loads(infile.readline())["data"]
+
+    def restore(self) -> Optional[dict]:
+        """Rebuild the author of an interrupted run, or None to start afresh"""
+        started, author_offset, publications = self._scan()
+        if author_offset is None or time.time() - (started or 0) > self.max_age:
+            self.discard()
+            return None
+
+        with open(self.path, "rb") as infile:
+            author = self._read(infile, author_offset)
+        author["partial"] = True
+        author["publications"] = [
+            _stub(pub) if pub["author_pub_id"] in publications else pub
+            for pub in author.get("publications", [])
+        ]
+        print(
+            f"♻️  Restored checkpoint with {len(publications)}/"
+            f"{len(author['publications'])} filled publications"
+        )
+        return author
+
+    def compact(
+        self,
+        author: dict,
+        path: str,
+        fallback: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Write ``author`` as keyed ``gs_data.json`` and atomically replace ``path``
+
+        Publications come from the checkpoint where one was recorded and
+        from the in-memory listing otherwise; ids only found in
+        ``fallback`` are appended at the end. Records are streamed from
+        disk one at a time. Returns the number of publications written.
+        """
+        _, _, offsets = self._scan()
+        fields = {k: v for k, v in author.items() if k != "publications"}
+        written = set()
+
+        with atomic_open(path) as outfile:
+            outfile.write(json.dumps(fields, ensure_ascii=False)[:-1])
+            outfile.write((", " if fields else "") + '"publications": {')
+            infile = open(self.path, "rb") if offsets else None
+            try:
+                for pub in author.get("publications", []):
+                    pub_id = pub["author_pub_id"]
+                    if pub_id in written:
+                        continue
+                    if pub_id in offsets:
+                        pub = self._read(infile, offsets[pub_id])
+                    self._write_entry(outfile, pub_id, pub, not written)
+                    written.add(pub_id)
+            finally:
+                if infile is not None:
+                    infile.close()
+            for pub_id, pub in (fallback or {}).items():
+                if pub_id not in written:
+                    self._write_entry(outfile, pub_id, pub, not written)
+                    written.add(pub_id)
+            outfile.write("}}")
+        return len(written)
+
+    @staticmethod
+    def _write_entry(outfile, pub_id: str, pub: dict, first: bool) -> None:
+        if not first:
+            outfile.write(", ")
+        outfile.write(json.dumps(pub_id) + ": " + json.dumps(pub, ensure_ascii=False))
+
+    def discard(self) -> None:
+        """Remove the checkpoint once its data has been compacted"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
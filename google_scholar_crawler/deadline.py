@@ -0,0 +1,66 @@
+"""Cooperative time budget for a crawl, usable from any thread"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class DeadlineExceeded(BaseException):
+    """Raised when a crawl has used up its time budget
+
+    Derives from ``BaseException`` so that scholarly's internal
+    ``except Exception`` retry loops do not swallow it and keep
+    retrying after the budget is gone.
+    """
+
+
+class Deadline:
+    """A point in time by which a crawl (or one phase of it) must finish"""
+
+    def __init__(self, seconds: float, parent: Optional["Deadline"] = None):
+        self.expires_at = time.monotonic() + seconds
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        """Raise ``DeadlineExceeded`` if the budget is used up"""
+        if self.expired():
+            raise DeadlineExceeded("Google Scholar crawl ran out of time")
+
+    def phase(self, max_seconds: float) -> "Deadline":
+        """A sub-budget capped at ``max_seconds`` that never outlives this one"""
+        return Deadline(max_seconds, parent=self)
+
+    def cap_timeout(self, timeout):
+        """Shrink a requests-style timeout so it ends before the deadline"""
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
+
+    @contextmanager
+    def activate(self):
+        """Make this the deadline enforced on requests sent from this context"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline active in this context, if any"""
+    return _current.get()
@@ -0,0 +1,39 @@
+"""Pre-flight check that skips crawling while the last results are fresh
+
+Only the standard library is imported here, so the check runs in
+milliseconds, before the crawler's dependencies are imported or even
+installed.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+def results_age(path: str, scholar_id: str, now: Optional[datetime] = None) -> Optional[timedelta]:
+    """Age of the results at ``path``, or None if they cannot be reused
+
+    Results that are missing or unreadable, that are a failure
+    placeholder or partial, or that belong to another author never count
+    as fresh.
+    """
+    try:
+        with open(path, "r") as infile:
+            data = json.load(infile)
+        updated = datetime.fromisoformat(data["updated"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if data.get("error") or data.get("partial") or data.get("scholar_id") != scholar_id:
+        return None
+    return (now or datetime.now()) - updated
+
+
+def is_fresh(path: str, scholar_id: str, max_age_hours: float, now: Optional[datetime] = None) -> bool:
+    """Whether the results at ``path`` were updated within ``max_age_hours``
+
+    A window of 0 (or less) disables the check.
+    """
+    if max_age_hours <= 0:
+        return False
+    age = results_age(path, scholar_id, now)
+    return age is not None and timedelta(0) <= age < timedelta(hours=max_age_hours)
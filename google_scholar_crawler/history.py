@@ -0,0 +1,191 @@
+"""Compact time series of citation counts across crawler runs"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from atomic_file import atomic_open
+
+MAGIC = b"GSHIST1\n"
+MISSING = -1  # Paper not on the profile (yet) at that snapshot
+TOTAL = "citedby"  # Series holding the author's total citations
+
+
+class CitationHistory:
+    """Daily snapshots of ``citedby`` and per-publication ``num_citations``
+
+    Counts are kept as one ``int32`` column per series (the author total
+    plus one per ``author_pub_id``), with one row per snapshot day. On
+    disk the columns are zlib-compressed behind a small JSON index, so
+    years of daily snapshots for hundreds of papers take a few hundred KB
+    and load without any per-value parsing.
+    """
+
+    def __init__(self):
+        self.dates: List[date] = []
+        self.columns: Dict[str, array] = {TOTAL: array("i")}
+
+    @classmethod
+    def load(cls, path: str) -> "CitationHistory":
+        """Read the history at ``path``; a missing or unreadable file starts a new one"""
+        try:
+            with open(path, "rb") as infile:
+                data = infile.read()
+        except FileNotFoundError:
+            return cls()
+        try:
+            return cls._decode(data)
+        except (ValueError, KeyError, TypeError, struct.error, zlib.error) as e:
+            print(f"⚠️  {path} is corrupt ({e}), starting a new citation history")
+            return cls()
+
+    @classmethod
+    def _decode(cls, data: bytes) -> "CitationHistory":
+        if not data.startswith(MAGIC):
+            raise ValueError("not a citation history file")
+
+        offset = len(MAGIC)
+        (index_len,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        index = json.loads(data[offset : offset + index_len])
+        body = array("i")
+        body.frombytes(zlib.decompress(data[offset + index_len :]))
+        if sys.byteorder != "little":
+            body.byteswap()
+
+        history = cls()
+        history.dates = [date.fromordinal(d) for d in index["dates"]]
+        rows = len(history.dates)
+        if len(body) != rows * len(index["series"]):
+            raise ValueError("columns do not match the index")
+        history.columns = {
+            name: body[i * rows : (i + 1) * rows]
+            for i, name in enumerate(index["series"])
+        }
+        return history
+
+    def save(self, path: str) -> None:
+        """Atomically write the history to ``path``"""
+        series = list(self.columns)
+        body = array("i")
+        for name in series:
+            body.extend(self.columns[name])
+        if sys.byteorder != "little":
+            body.byteswap()
+        index = json.dumps(
+            {"dates": [d.toordinal() for d in self.dates], "series": series}
+        ).encode()
+
+        with atomic_open(path, "wb") as outfile:
+            outfile.write(MAGIC)
+            outfile.write(struct.pack("<I", len(index)))
+            outfile.write(index)
+            outfile.write(zlib.compress(body.tobytes(), 9))
+
+    def record(self, day: date, citedby: int, counts: Dict[str, int]) -> None:
+        """Add the snapshot for ``day``, replacing one already taken that day"""
+        if self.dates and day < self.dates[-1]:
+            raise ValueError(f"Snapshot {day} is older than the last one {self.dates[-1]}")
+        if not self.dates or self.dates[-1] != day:
+            self.dates.append(day)
+            for column in self.columns.values():
+                column.append(MISSING)
+
+        rows = len(self.dates)
+        for name, value in [(TOTAL, citedby), *counts.items()]:
+            column = self.columns.get(name)
+            if column is None:
+                column = self.columns[name] = array("i", [MISSING]) * rows
+            column[-1] = int(value)
+
+    def _row(self, day: date) -> int:
+        """Index of the last snapshot taken on or before ``day``"""
+        lo, hi = 0, len(self.dates)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.dates[mid] <= day:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            raise KeyError(f"No snapshot on or before {day}")
+        return lo - 1
+
+    def series(self, pub_id: str = TOTAL) -> List[Tuple[date, int]]:
+        """All known ``(day, count)`` points of one paper (or of the total)"""
+        column = self.columns[pub_id]
+        return [(d, v) for d, v in zip(self.dates, column) if v != MISSING]
+
+    def count(self, pub_id: str = TOTAL, day: Optional[date] = None) -> Optional[int]:
+        """Count as of ``day`` (latest by default), None if not on the profile yet"""
+        row = len(self.dates) - 1 if day is None else self._row(day)
+        value = self.columns[pub_id][row]
+        return None if value == MISSING else value
+
+    def delta(self, pub_id: str, start: date, end: Optional[date] = None) -> int:
+        """Citations gained between ``start`` and ``end`` (latest by default)"""
+        before = self.count(pub_id, start) or 0
+        after = self.count(pub_id, end) or 0
+        return after - before
+
+    def growth_rate(self, pub_id: str = TOTAL, days: int = 30) -> float:
+        """Average citations gained per day over the last ``days`` days"""
+        if not self.dates:
+            return 0.0
+        end = self.dates[-1]
+        try:
+            start_row = self._row(end - timedelta(days=days))
+        except KeyError:
+            start_row = 0
+        elapsed = (end - self.dates[start_row]).days
+        if elapsed <= 0:
+            return 0.0
+        start_value = self.columns[pub_id][start_row]
+        before = 0 if start_value == MISSING else start_value
+        return ((self.count(pub_id) or 0) - before) / elapsed
+
+    def h_index(self, day: Optional[date] = None) -> int:
+        """h-index computed from the per-paper counts as of ``day``"""
+        row = len(self.dates) - 1 if day is None else self._row(day)
+        counts = sorted(
+            (column[row] for name, column in self.columns.items() if name != TOTAL),
+            reverse=True,
+        )
+        h = 0
+        for rank, value in enumerate(counts, start=1):
+            if value < rank:
+                break
+            h = rank
+        return h
+
+    def h_index_series(self) -> List[Tuple[date, int]]:
+        """h-index at every snapshot"""
+        return [(d, self.h_index(d)) for d in self.dates]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the citation history")
+    parser.add_argument("path", nargs="?", default=os.path.join("results", "citation_history.bin"))
+    parser.add_argument("--paper", help="author_pub_id to show (default: total citations)")
+    parser.add_argument("--days", type=int, default=30, help="Window for growth rates")
+    args = parser.parse_args(argv)
+
+    history = CitationHistory.load(args.path)
+    if not history.dates:
+        print(f"No snapshots in {args.path}")
+        return
+    pub_id = args.paper or TOTAL
+    print(f"📅 {len(history.dates)} snapshots from {history.dates[0]} to {history.dates[-1]}")
+    print(f"📈 {pub_id}: {history.count(pub_id)} citations")
+    print(f"📈 Growth: {history.growth_rate(pub_id, args.days):.2f} citations/day over {args.days} days")
+    print(f"📈 h-index: {history.h_index()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Persistent cache for Google Scholar pages"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+HOUR = 60 * 60
+
+# First matching pattern decides how long a cached page stays fresh
+DEFAULT_TTL_RULES: List[Tuple[str, int]] = [
+    # Publication detail pages change rarely; stay below the daily cron period
+    (r"view_op=view_citation", 20 * HOUR),
+    # Author profile and publication list pages carry the citation counts
+    (r"/citations\?", 6 * HOUR),
+]
+DEFAULT_TTL = 6 * HOUR
+
+# Describe the transfer, not the stored (already decoded) body
+_UNCACHED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class CachedPage:
+    """A response stored in the cache"""
+
+    __slots__ = ("url", "status", "headers", "body", "etag", "last_modified", "expires_at")
+
+    def __init__(self, url, status, headers, body, etag, last_modified, expires_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this page"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, request) -> Response:
+        """Rebuild a ``requests.Response`` as if it came from the network"""
+        response = Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response.reason = "OK"
+        response.request = request
+        response.from_cache = True
+        return response
+
+
+class ResponseCache:
+    """SQLite-backed page cache with per-URL TTLs and LRU eviction
+
+    Pages are evicted least-recently-used first once the stored bodies
+    exceed ``max_bytes``. Stale pages are kept so that they can be
+    revalidated with ``If-None-Match``/``If-Modified-Since``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl_rules: Optional[List[Tuple[str, int]]] = None,
+        default_ttl: int = DEFAULT_TTL,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_rules = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules)
+        ]
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not be shared with forked worker processes
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._conn
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Look up ``url``, fresh or stale"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT status, headers, body, etag, last_modified, expires_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE url = ?",
+                    (time.time(), url),
+                )
+        status, headers, body, etag, last_modified, expires_at = row
+        return CachedPage(
+            url, status, json.loads(headers), body, etag, last_modified, expires_at
+        )
+
+    def put(self, url: str, response: Response) -> None:
+        """Store a successful response for ``url``"""
+        now = time.time()
+        body = response.content
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, status, headers, body, size, etag, last_modified, "
+                    "expires_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        response.status_code,
+                        json.dumps(
+                            {
+                                name: value
+                                for name, value in response.headers.items()
+                                if name.lower() not in _UNCACHED_HEADERS
+                            }
+                        ),
+                        body,
+                        len(body),
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        now + self.ttl_for(url),
+                        now,
+                    ),
+                )
+                self._evict(conn)
+
+    def refresh(self, url: str) -> None:
+        """Extend the lifetime of a page the server confirmed as unchanged"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "UPDATE responses SET expires_at = ?, last_access = ? WHERE url = ?",
+                    (now + self.ttl_for(url), now, url),
+                )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT url, size FROM responses ORDER BY last_access"
+        ).fetchall()
+        victims = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE url = ?", victims)
@@ -1,46 +1,110 @@
+import argparse
 import json
 import os
-import signal
 import sys
 import time
-from datetime import datetime
-from typing import Any, Dict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
-import requests
-from requests.adapters import HTTPAdapter
-from scholarly import scholarly
-from urllib3.util.retry import Retry
+# scholarly, requests and urllib3 are imported where a crawl needs them, so
+# that a run skipped by the freshness check finishes in milliseconds
+from checkpoint import Checkpoint
+from deadline import Deadline, DeadlineExceeded
+from freshness import is_fresh, results_age
+from history import CitationHistory
+from metrics import METRICS
+from payload import bake_site_data, write_citation_payload
+from results_history import ResultsHistory
+from proxy_pool import ProxyPool, read_proxies
+from rate_limiter import RateLimiter
 
+RESULTS_DIR = "results"
+GS_DATA_FILE = "gs_data.json"
+SHIELDSIO_FILE = "gs_data_shieldsio.json"
+CHECKPOINT_FILE = "gs_data.checkpoint.jsonl"
+HISTORY_FILE = "citation_history.bin"
+RESULTS_HISTORY_DIR = "gs_data_history"  # Base snapshots and daily deltas of gs_data.json
+METRICS_FILE = "crawl_metrics.json"
+RATE_FILE = "rate_limit.json"  # Request rate learned by the adaptive limiter
 
-def timeout_handler(signum, frame):
-    """Handle timeout signal"""
-    raise TimeoutError("Google Scholar request timed out")
+# Sections that only need the author profile pages (one request per 100 pubs)
+SUMMARY_SECTIONS = ["basics", "indices", "counts", "publications"]
+# Without these (name, citation counts) partial data is not worth saving
+PROFILE_SECTIONS = ["basics", "counts"]
 
+MAX_ATTEMPTS = 3
+TIMEOUT_SECONDS = int(
+    os.environ.get("SCHOLAR_TIMEOUT", "600") or "600"
+)  # Default 10 minutes per attempt
+SEARCH_BUDGET_SECONDS = 120  # Upper bound for the author search phase
+# Opt-in: deep-filling costs one extra request per new or changed publication
+INCREMENTAL = os.environ.get("SCHOLAR_INCREMENTAL", "false").lower() in ("1", "true", "yes")
+
+# Publication detail pages of one author fetched concurrently; requests in
+# flight are still capped by the rate limiter's --max-per-host
+FILL_CONCURRENCY = max(1, int(os.environ.get("SCHOLAR_FILL_CONCURRENCY", "4") or "4"))
+
+# On-disk cache of fetched pages, shared by all attempts, workers and local re-runs
+CACHE_ENABLED = os.environ.get("SCHOLAR_CACHE", "true").lower() in ("1", "true", "yes")
+CACHE_FILE = os.environ.get("SCHOLAR_CACHE_FILE", os.path.join(".cache", "scholar_http.sqlite"))
+CACHE_MAX_MB = int(os.environ.get("SCHOLAR_CACHE_MAX_MB", "200") or "200")
+
+# Send Google Scholar requests to another server, e.g. benchmark/mock_scholar.py
+SCHOLAR_ORIGIN = os.environ.get("SCHOLAR_ORIGIN") or None
+
+# Egress proxies (comma-separated URLs and/or a file with one per line)
+PROXIES = os.environ.get("SCHOLAR_PROXIES")
+PROXIES_FILE = os.environ.get("SCHOLAR_PROXIES_FILE")
 
-def configure_scholarly_session():
+# Jekyll data file the site renders its citation counts from (empty: don't write)
+SITE_DATA_FILE = os.environ.get("SCHOLAR_SITE_DATA", os.path.join("..", "_data", "citations.json"))
+
+# Skip authors whose results were updated less than this many hours ago (0: always crawl)
+MAX_AGE_HOURS = float(os.environ.get("SCHOLAR_MAX_AGE_HOURS", "0") or "0")
+
+
+def configure_scholarly_session(
+    limiter: Optional[RateLimiter] = None, proxies: Optional[ProxyPool] = None
+):
     """Configure scholarly library with timeout and retry settings"""
-    try:
-        # Configure requests session with timeout and retries
-        session = requests.Session()
+    from scholarly import scholarly
+    from urllib3.util.retry import Retry
 
+    from http_cache import ResponseCache
+    from scholar_http import SCHOLAR_HOST, ScholarAdapter, install_adapter
+
+    try:
         # Set up retry strategy
         retry_strategy = Retry(
             total=3,  # Total number of retries
-            status_forcelist=[429, 500, 502, 503, 504],  # HTTP status codes to retry
+            # 429 and 503 are left to the adaptive rate limiter, which slows
+            # every worker down instead of hammering the same request again
+            status_forcelist=[500, 502, 504],  # HTTP status codes to retry
+            respect_retry_after_header=False,  # Otherwise urllib3 retries 429s itself
             backoff_factor=2,  # Wait time between retries (exponential backoff)
             raise_on_status=False,
         )
 
-        # Create adapter with retry strategy
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        # Set timeout for all requests
-        session.timeout = 30  # 30 seconds per request
+        # Create adapter with retry strategy, paced by the shared rate limiter
+        adapter = ScholarAdapter(
+            limiters={SCHOLAR_HOST: limiter} if limiter is not None else None,
+            cache=(
+                ResponseCache(CACHE_FILE, max_bytes=CACHE_MAX_MB * 1024 * 1024)
+                if CACHE_ENABLED
+                else None
+            ),
+            origin=SCHOLAR_ORIGIN,
+            proxies=proxies,
+            max_retries=retry_strategy,
+            # Keep a warm connection for every concurrent publication fill
+            pool_maxsize=max(10, FILL_CONCURRENCY),
+        )
 
-        # Configure scholarly to use this session
-        scholarly.set_timeout(30)
+        # Configure scholarly to send every request through this adapter
+        install_adapter(adapter)
+        scholarly.set_timeout(30)  # 30 seconds per request
         print("✅ Scholarly session configured with timeout and retry settings")
 
     except Exception as e:
@@ -48,126 +112,555 @@ def configure_scholarly_session():
         print("Proceeding with default settings...")
 
 
-def scrape_with_timeout(timeout_seconds: int = 300) -> Dict[Any, Any]:
-    """Scrape Google Scholar data with timeout protection"""
-    # Set up signal handler for timeout
-    signal.signal(signal.SIGALRM, timeout_handler)
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Load publications of the previous successful run, keyed by author_pub_id"""
+    try:
+        with open(path, "r") as infile:
+            previous = json.load(infile)
+    except (OSError, ValueError):
+        return {}
+
+    # Placeholder files from failed runs carry no usable publications
+    if "error" in previous or not isinstance(previous.get("publications"), dict):
+        return {}
+    return previous["publications"]
+
 
+def profile_filled(author: dict) -> bool:
+    """Whether the profile page sections of ``author`` have been filled"""
+    return all(section in author.get("filled", []) for section in PROFILE_SECTIONS)
+
+
+def has_results(path: str) -> bool:
+    """Whether ``path`` holds the results of an earlier crawl, not a placeholder"""
     try:
-        # Set timeout
-        signal.alarm(timeout_seconds)
+        with open(path, "r") as infile:
+            previous = json.load(infile)
+    except (OSError, ValueError):
+        return False
+    return isinstance(previous, dict) and "error" not in previous and "citedby" in previous
 
-        print(
-            f"Starting to scrape Google Scholar for user: {os.environ['GOOGLE_SCHOLAR_ID']}"
-        )
-        print(f"Timeout set to {timeout_seconds} seconds")
-
-        # Search for author
-        print("Step 1: Searching for author...")
-        signal.alarm(120)  # 2 minutes for author search
-        author: dict = scholarly.search_author_id(os.environ["GOOGLE_SCHOLAR_ID"])
-        print("Author found successfully")
-
-        # Fill author information
-        print("Step 2: Filling author information...")
-        signal.alarm(timeout_seconds - 120)  # Remaining time for filling data
-        scholarly.fill(author, sections=["basics", "indices", "counts", "publications"])
-        print("Author information filled successfully")
-
-        # Cancel timeout
-        signal.alarm(0)
+
+def write_badge(results_dir: str, message: str) -> None:
+    """Write the shields.io endpoint of the citations badge"""
+    shieldio_data = {
+        "schemaVersion": 1,
+        "label": "citations",
+        "message": message,
+    }
+    with open(os.path.join(results_dir, SHIELDSIO_FILE), "w") as outfile:
+        json.dump(shieldio_data, outfile, ensure_ascii=False)
+
+
+def _fill_publication(pub: dict, deadline: Deadline) -> dict:
+    from scholarly import scholarly
+
+    deadline.check()
+    with METRICS.time("scholar_publication_fill_seconds"):
+        scholarly.fill(pub)
+    return pub
+
+
+def fill_publications(
+    publications: List[dict],
+    indexes: List[int],
+    deadline: Deadline,
+    checkpoint: Checkpoint,
+    concurrency: int = FILL_CONCURRENCY,
+) -> int:
+    """Deep-fill ``publications[i]`` for each ``i`` in ``indexes``, several at a time
+
+    Detail pages are fetched by up to ``concurrency`` threads sharing
+    scholarly's keep-alive session and the rate limiter. Each result is
+    streamed to ``checkpoint`` as soon as it arrives and its stub is put
+    back at its own index, so the listing keeps Google Scholar's order
+    whatever order the fetches finish in. The first error cancels the
+    fills not yet started and is raised once the running ones are
+    recorded. Returns the number of publications filled.
+    """
+    filled = 0
+    error = None
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(indexes))), thread_name_prefix="fill"
+    ) as executor:
+        # Each fill runs in a copy of this context, so it sees the active deadline
+        futures = {
+            executor.submit(
+                copy_context().run, _fill_publication, publications[index], deadline
+            ): index
+            for index in indexes
+        }
+        for future in as_completed(futures):
+            try:
+                pub = future.result()
+            except BaseException as e:
+                if error is None:
+                    error = e
+                    for pending in futures:
+                        pending.cancel()
+                continue
+            publications[futures[future]] = checkpoint.record_publication(pub)
+            METRICS.inc("scholar_publications_total", outcome="deep_filled")
+            filled += 1
+    if error is not None:
+        raise error
+    return filled
+
+
+def fill_publications_incrementally(
+    author: dict, baseline: Dict[str, Any], deadline: Deadline, checkpoint: Checkpoint
+) -> None:
+    """Deep-fill only new or changed publications, reusing the baseline for the rest
+
+    Each publication is streamed to ``checkpoint`` as soon as it is done
+    and only a stub is kept in memory.
+    """
+    publications = author["publications"]
+    reused = 0
+    to_fill = []
+    for index, pub in enumerate(publications):
+        if pub.get("filled"):
+            # Reused or deep-filled by an earlier attempt
+            continue
+
+        previous = baseline.get(pub["author_pub_id"])
+        if (
+            previous is not None
+            and previous.get("filled")
+            and previous.get("num_citations") == pub.get("num_citations")
+        ):
+            publications[index] = checkpoint.record_publication(previous)
+            METRICS.inc("scholar_publications_total", outcome="reused")
+            reused += 1
+            continue
+
+        to_fill.append(index)
+
+    changed = fill_publications(publications, to_fill, deadline, checkpoint)
+    print(
+        f"Deep-filled {changed} new or changed publications, "
+        f"reused {reused} from baseline, "
+        f"{len(publications) - changed - reused} already done by earlier attempts"
+    )
+
+
+def scrape_with_deadline(
+    scholar_id: str,
+    results_dir: str,
+    deadline: Deadline,
+    checkpoint: Checkpoint,
+    author: Optional[dict] = None,
+) -> Dict[Any, Any]:
+    """Scrape Google Scholar data within ``deadline``, resuming from ``author``
+
+    When the budget runs out (or a request fails) after the author was
+    found, the data collected so far is returned with ``partial`` set so
+    that the next attempt can pick up where this one stopped.
+    """
+    from scholarly import scholarly
+
+    with deadline.activate():
+        print(f"Starting to scrape Google Scholar for user: {scholar_id}")
+        print(f"Time budget: {deadline.remaining():.0f} seconds")
+
+        if author is None:
+            # Search for author
+            print("Step 1: Searching for author...")
+            with deadline.phase(SEARCH_BUDGET_SECONDS).activate(), METRICS.time(
+                "scholar_phase_seconds", phase="search"
+            ):
+                author = scholarly.search_author_id(scholar_id)
+            print("Author found successfully")
+        else:
+            print(f"Step 1: Resuming partial data for {author.get('name', scholar_id)}")
+        author["partial"] = True
+
+        try:
+            # Fill author information; sections filled by earlier attempts are skipped
+            print("Step 2: Filling author information...")
+            filled_before = list(author["filled"])
+            with METRICS.time("scholar_phase_seconds", phase="summary"):
+                scholarly.fill(author, sections=SUMMARY_SECTIONS)
+            if author["filled"] != filled_before:
+                checkpoint.record_author(author)
+            print("Author information filled successfully")
+
+            if INCREMENTAL:
+                print("Step 3: Refreshing new or changed publications...")
+                with METRICS.time("scholar_phase_seconds", phase="publications"):
+                    fill_publications_incrementally(
+                        author,
+                        load_baseline(os.path.join(results_dir, GS_DATA_FILE)),
+                        deadline,
+                        checkpoint,
+                    )
+        except DeadlineExceeded as e:
+            METRICS.inc("scholar_deadline_exceeded_total")
+            if not profile_filled(author):
+                raise  # Nothing to keep beyond the search result
+            print(f"⏰ {e}, keeping partial data")
+            return author
+        except Exception as e:
+            if not profile_filled(author):
+                # Usually the profile page itself was blocked
+                print(f"ERROR: The author profile could not be filled: {e}")
+                raise
+            print(f"ERROR: Unexpected error occurred: {e}, keeping partial data")
+            return author
+
+        del author["partial"]
         return author
 
-    except TimeoutError as e:
-        print(f"ERROR: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"ERROR: Unexpected error occurred: {e}")
-        sys.exit(1)
-    finally:
-        # Make sure to cancel any pending alarm
-        signal.alarm(0)
 
+def record_history(citedby: int, counts: Dict[str, int], path: str) -> None:
+    """Append today's citation counts to the history store"""
+    history = CitationHistory.load(path)
+    history.record(date.today(), citedby, counts)
+    history.save(path)
+    print(f"📅 Citation history: {len(history.dates)} snapshots")
 
-# Configure scholarly library
-configure_scholarly_session()
 
-# Main execution with timeout protection and retry logic
-MAX_ATTEMPTS = 3
-TIMEOUT_SECONDS = int(
-    os.environ.get("SCHOLAR_TIMEOUT", "600") or "600"
-)  # Default 10 minutes
-print(f"🔧 Timeout configured: {TIMEOUT_SECONDS} seconds")
+def record_results(results_path: str, history_dir: str) -> None:
+    """Add today's full results to the delta-encoded results history"""
+    with open(results_path, "r") as infile:
+        results = json.load(infile)
+    history = ResultsHistory(history_dir)
+    if history.record(date.today(), results):
+        entry = history.entries[-1]
+        kind = "base snapshot" if entry["base"] == len(history.entries) - 1 else "delta"
+        print(f"🗂️  Results history: stored a {entry['size'] / 1024:.1f} KB {kind}")
+    else:
+        print("🗂️  Results history: unchanged, nothing written")
 
-author = None
-for attempt in range(1, MAX_ATTEMPTS + 1):
-    try:
-        print(f"\n🔄 Attempt {attempt}/{MAX_ATTEMPTS} to scrape Google Scholar data")
-        author = scrape_with_timeout(TIMEOUT_SECONDS)
-        print("✅ Data scraping completed successfully!")
-        break
-    except (TimeoutError, Exception) as e:
-        print(f"❌ Attempt {attempt} failed: {e}")
+
+def crawl_author(scholar_id: str, results_dir: str) -> bool:
+    """Crawl one author with retries and write its results into ``results_dir``"""
+    checkpoint = Checkpoint(os.path.join(results_dir, CHECKPOINT_FILE))
+    # Pick up the progress of a run that crashed or was cancelled
+    author = checkpoint.restore()
+    if author is not None and author.get("scholar_id") != scholar_id:
+        checkpoint.discard()
+        author = None
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            print(f"\n🔄 Attempt {attempt}/{MAX_ATTEMPTS} to scrape Google Scholar data")
+            with METRICS.time("scholar_phase_seconds", phase="attempt"):
+                author = scrape_with_deadline(
+                    scholar_id, results_dir, Deadline(TIMEOUT_SECONDS), checkpoint, author
+                )
+            if not author.get("partial"):
+                METRICS.inc("scholar_attempts_total", outcome="complete")
+                print("✅ Data scraping completed successfully!")
+                break
+            METRICS.inc("scholar_attempts_total", outcome="partial")
+            error = "time budget exhausted or request failed with partial data"
+        except (DeadlineExceeded, Exception) as e:
+            METRICS.inc("scholar_attempts_total", outcome="failed")
+            error = e
+
+        print(f"❌ Attempt {attempt} failed: {error}")
         if attempt < MAX_ATTEMPTS:
-            wait_time = min(
-                60 * attempt, 300
-            )  # Progressive wait: 60s, 120s, then max 5min
+            wait_time = min(60 * attempt, 300)  # Progressive wait: 60s, 120s, then max 5min
             print(f"⏳ Waiting {wait_time} seconds before retry...")
+            METRICS.inc("scholar_attempt_wait_seconds_total", wait_time)
             time.sleep(wait_time)
         else:
             print("🚨 All attempts to scrape Google Scholar data have failed.")
-            print(f"🚨 Final error: {e}")
-            print("⚠️  Continuing without Google Scholar data...")
-
-# Graceful handling when scraping fails
-if author is None:
-    print("⚠️  Google Scholar data could not be retrieved after all attempts.")
-    print("📝 Creating placeholder data files to prevent workflow failure...")
-
-    # Create minimal placeholder data
-    placeholder_author = {
-        "name": "Unknown",
-        "updated": str(datetime.now()),
-        "publications": {},
-        "citedby": 0,
-        "error": "Failed to scrape Google Scholar data",
-    }
+            print(f"🚨 Final error: {error}")
+            if author is not None:
+                print("⚠️  Saving partial Google Scholar data...")
+            else:
+                print("⚠️  Continuing without Google Scholar data...")
 
-    os.makedirs("results", exist_ok=True)
-    with open("results/gs_data.json", "w") as outfile:
-        json.dump(placeholder_author, outfile, ensure_ascii=False)
+    if author is not None and not profile_filled(author):
+        # Not even the profile page was filled: nothing to replace the last results with
+        print("⚠️  No profile data was filled, discarding the partial data")
+        author = None
 
-    placeholder_shieldio_data = {
-        "schemaVersion": 1,
-        "label": "citations",
-        "message": "N/A",
-    }
-    with open("results/gs_data_shieldsio.json", "w") as outfile:
-        json.dump(placeholder_shieldio_data, outfile, ensure_ascii=False)
-
-    print("✅ Placeholder files created. Workflow can continue.")
-    print("💡 Check your GOOGLE_SCHOLAR_ID and SCHOLAR_TIMEOUT settings.")
-else:
-    # Process and save the scraped data successfully
-    print("📊 Processing scraped data...")
-    name = author["name"]
-    author["updated"] = str(datetime.now())
-    author["publications"] = {v["author_pub_id"]: v for v in author["publications"]}
-    print(f"📈 Found {len(author['publications'])} publications for {name}")
-    print(json.dumps(author, indent=2))
-
-    os.makedirs("results", exist_ok=True)
-    with open("results/gs_data.json", "w") as outfile:
-        json.dump(author, outfile, ensure_ascii=False)
+    # Graceful handling when scraping fails
+    if author is None and has_results(os.path.join(results_dir, GS_DATA_FILE)):
+        print("⚠️  Google Scholar data could not be retrieved after all attempts.")
+        print("📝 Keeping the results of the previous run in place")
+        # Only gs_data.json is restored, but the badge and the payload are published too
+        with open(os.path.join(results_dir, GS_DATA_FILE), "r") as infile:
+            citedby = json.load(infile)["citedby"]
+        counts = {
+            pub_id: pub.get("num_citations", 0)
+            for pub_id, pub in load_baseline(os.path.join(results_dir, GS_DATA_FILE)).items()
+        }
+        write_citation_payload(results_dir, citedby, counts)
+        write_badge(results_dir, f"{citedby}")
+    elif author is None:
+        print("⚠️  Google Scholar data could not be retrieved after all attempts.")
+        print("📝 Creating placeholder data files to prevent workflow failure...")
 
-    shieldio_data = {
-        "schemaVersion": 1,
-        "label": "citations",
-        "message": f"{author['citedby']}",
-    }
-    with open("results/gs_data_shieldsio.json", "w") as outfile:
-        json.dump(shieldio_data, outfile, ensure_ascii=False)
+        # Create minimal placeholder data
+        placeholder_author = {
+            "name": "Unknown",
+            "updated": str(datetime.now()),
+            "publications": {},
+            "citedby": 0,
+            "error": "Failed to scrape Google Scholar data",
+        }
+
+        os.makedirs(results_dir, exist_ok=True)
+        with open(os.path.join(results_dir, GS_DATA_FILE), "w") as outfile:
+            json.dump(placeholder_author, outfile, ensure_ascii=False)
+
+        write_badge(results_dir, "N/A")
+
+        print("✅ Placeholder files created. Workflow can continue.")
+        print("💡 Check your GOOGLE_SCHOLAR_ID and SCHOLAR_TIMEOUT settings.")
+    else:
+        # Process and save the scraped data successfully
+        print("📊 Processing scraped data...")
+        author["updated"] = str(datetime.now())
+        fallback = None
+        if author.get("partial") and "publications" not in author["filled"]:
+            # The publication list was cut short; keep the rest from the baseline
+            fallback = load_baseline(os.path.join(results_dir, GS_DATA_FILE))
+
+        os.makedirs(results_dir, exist_ok=True)
+        with METRICS.time("scholar_phase_seconds", phase="save"):
+            num_publications = checkpoint.compact(
+                author, os.path.join(results_dir, GS_DATA_FILE), fallback
+            )
+        checkpoint.discard()
+
+        citedby = author.get("citedby", 0)
+        counts = {
+            pub_id: pub.get("num_citations", 0) for pub_id, pub in (fallback or {}).items()
+        }
+        counts.update(
+            (pub["author_pub_id"], pub.get("num_citations", 0))
+            for pub in author.get("publications", [])
+        )
+        write_citation_payload(results_dir, citedby, counts)
+        if "publications" in author["filled"]:
+            record_history(citedby, counts, os.path.join(results_dir, HISTORY_FILE))
+        if not author.get("partial"):
+            record_results(
+                os.path.join(results_dir, GS_DATA_FILE),
+                os.path.join(results_dir, RESULTS_HISTORY_DIR),
+            )
+        print(
+            f"📈 Found {num_publications} publications for {author.get('name')}: "
+            f"{author.get('citedby', 'N/A')} citations, h-index {author.get('hindex', 'N/A')}"
+            + (" (partial)" if author.get("partial") else "")
+        )
+
+        write_badge(results_dir, f"{author.get('citedby', 'N/A')}")
+
+        print("✅ Google Scholar data saved successfully!")
+
+    return author is not None
+
+
+def _init_worker(limiter: RateLimiter, proxies: Optional[ProxyPool]):
+    """Configure scholarly once in every worker process"""
+    configure_scholarly_session(limiter, proxies)
+
+
+def _crawl_in_worker(scholar_id: str, results_dir: str):
+    """Crawl one author in a worker process and hand its metrics back"""
+    METRICS.reset()
+    ok = crawl_author(scholar_id, results_dir)
+    return ok, METRICS.snapshot()
+
+
+def read_scholar_ids(ids: List[str], ids_file: Optional[str]) -> List[str]:
+    """Collect scholar IDs from the command line and an optional roster file"""
+    scholar_ids = list(ids)
+    if ids_file:
+        with open(ids_file, "r") as infile:
+            for line in infile:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    scholar_ids.append(line)
+    # Preserve roster order while dropping duplicates
+    return list(dict.fromkeys(scholar_ids))
+
+
+def crawl_roster(
+    scholar_ids: List[str],
+    workers: int,
+    limiter: RateLimiter,
+    proxies: Optional[ProxyPool] = None,
+) -> int:
+    """Crawl several authors concurrently, each into ``results/<id>/``"""
+    print(f"👥 Crawling {len(scholar_ids)} authors with {workers} workers")
+    failed = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(limiter, proxies)
+    ) as executor:
+        futures = {
+            executor.submit(
+                _crawl_in_worker, scholar_id, os.path.join(RESULTS_DIR, scholar_id)
+            ): scholar_id
+            for scholar_id in scholar_ids
+        }
+        for future in as_completed(futures):
+            scholar_id = futures[future]
+            try:
+                ok, snapshot = future.result()
+                METRICS.merge(snapshot)
+            except BaseException as e:
+                print(f"❌ Crawling {scholar_id} failed: {e}")
+                ok = False
+            if not ok:
+                failed.append(scholar_id)
+
+    print(f"👥 Crawled {len(scholar_ids) - len(failed)}/{len(scholar_ids)} authors")
+    if failed:
+        print(f"⚠️  Failed authors: {', '.join(sorted(failed))}")
+    return len(failed)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl Google Scholar citation data")
+    parser.add_argument(
+        "--ids", nargs="+", default=[], metavar="ID", help="Scholar IDs to crawl"
+    )
+    parser.add_argument(
+        "--ids-file", help="File with one scholar ID per line ('#' starts a comment)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Authors crawled concurrently"
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=2,
+        help="Maximum concurrent requests to Google Scholar",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.5,
+        help="Initial requests per second to Google Scholar, before any learned rate",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=2.0,
+        help="Upper bound for the adaptively learned request rate",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=MAX_AGE_HOURS,
+        metavar="HOURS",
+        help="Skip authors whose results are younger than this (0: always crawl)",
+    )
+    parser.add_argument(
+        "--check-fresh",
+        action="store_true",
+        help="Only check freshness: exit with 0 if no author needs a crawl, 1 otherwise",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=os.path.join(RESULTS_DIR, METRICS_FILE),
+        help="Where to write the per-run timing report",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        default=os.environ.get("SCHOLAR_PROMETHEUS_TEXTFILE"),
+        help="Also write metrics for the node_exporter textfile collector",
+    )
+    return parser.parse_args(argv)
+
+
+def build_proxy_pool(args, limiter: RateLimiter) -> Optional[ProxyPool]:
+    """Pool of the configured egress proxies, each paced like ``limiter``"""
+    urls = read_proxies(PROXIES, PROXIES_FILE)
+    if not urls:
+        return None
+    pool = ProxyPool(
+        urls,
+        limiter_factory=lambda: RateLimiter(
+            limiter.rate, args.max_per_host, max_rate=args.max_rate
+        ),
+    )
+    print(f"🔧 Proxy pool: {len(pool)} proxies")
+    return pool
+
+
+def results_path(scholar_id: str, batch: bool) -> str:
+    """``gs_data.json`` of an author; batch mode keeps one directory per author"""
+    results_dir = os.path.join(RESULTS_DIR, scholar_id) if batch else RESULTS_DIR
+    return os.path.join(results_dir, GS_DATA_FILE)
+
+
+def stale_authors(scholar_ids: List[str], max_age_hours: float, batch: bool) -> List[str]:
+    """The authors in ``scholar_ids`` whose results need a crawl"""
+    stale = []
+    for scholar_id in scholar_ids:
+        path = results_path(scholar_id, batch)
+        if is_fresh(path, scholar_id, max_age_hours):
+            age = results_age(path, scholar_id).total_seconds() / 3600
+            print(f"⏭️  {scholar_id}: results updated {age:.1f} hours ago, skipping")
+        else:
+            stale.append(scholar_id)
+    return stale
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Decide before anything heavy is imported or set up
+    scholar_ids = read_scholar_ids(args.ids, args.ids_file)
+    batch = bool(scholar_ids)
+    requested = scholar_ids or [os.environ["GOOGLE_SCHOLAR_ID"]]
+    stale = stale_authors(requested, args.max_age, batch)
+    if args.check_fresh:
+        return 1 if stale else 0
+    if not stale:
+        print(f"✅ All results are younger than {args.max_age:g} hours, nothing to crawl")
+        return 0
+
+    started = datetime.now()
+    run_start = time.perf_counter()
+    print(f"🔧 Timeout configured: {TIMEOUT_SECONDS} seconds")
+    print(f"🔧 Incremental mode: {'on' if INCREMENTAL else 'off'}")
+
+    limiter = RateLimiter(args.rate, args.max_per_host, max_rate=args.max_rate)
+    rate_file = os.path.join(RESULTS_DIR, RATE_FILE)
+    limiter.load(rate_file)
+    print(f"🔧 Request rate: {limiter.rate:.2f}/s")
+    proxies = build_proxy_pool(args, limiter)
+
+    try:
+        if batch:
+            # Batch mode: one results directory and badge per author
+            crawl_roster(stale, max(1, min(args.workers, len(stale))), limiter, proxies)
+        else:
+            # Configure scholarly library
+            configure_scholarly_session(limiter, proxies)
+            crawled = crawl_author(stale[0], RESULTS_DIR)
+            # Only inside the site's checkout, where the data directory exists
+            if crawled and SITE_DATA_FILE and os.path.isdir(os.path.dirname(SITE_DATA_FILE) or "."):
+                if bake_site_data(RESULTS_DIR, SITE_DATA_FILE):
+                    print(f"🍞 Baked the checked citation counts into {SITE_DATA_FILE}")
+    finally:
+        # A blocked run is exactly when the slowed-down rate must survive
+        limiter.save(rate_file)
+    print(f"🔧 Learned request rate: {limiter.rate:.2f}/s")
+
+    duration = time.perf_counter() - run_start
+    METRICS.write_json(
+        args.metrics_file,
+        started=str(started),
+        duration_seconds=duration,
+        scholar_ids=stale,
+        timeout_seconds=TIMEOUT_SECONDS,
+        workers=args.workers if batch else 1,
+        request_rate=limiter.rate,
+    )
+    if args.prometheus_textfile:
+        METRICS.write_prometheus(args.prometheus_textfile)
+    print(f"⏱️  Run took {duration:.1f} seconds, metrics written to {args.metrics_file}")
+    print("🏁 Script completed. Check results/ directory for output files.")
 
-    print("✅ Google Scholar data saved successfully!")
 
-print("🏁 Script completed. Check results/ directory for output files.")
+if __name__ == "__main__":
+    sys.exit(main())
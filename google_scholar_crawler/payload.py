@@ -0,0 +1,66 @@
+"""Minimal citation payload fetched by the website"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+from atomic_file import write_atomic
+
+PAYLOAD_NAME = "gs_citations"
+# Unchanged counts are re-stamped as checked at most this often
+CHECKED_EVERY = timedelta(hours=12)
+
+
+def write_citation_payload(results_dir: str, citedby: int, counts: Dict[str, int]) -> str:
+    """Write ``{citedby, num_citations}`` for the site's citation badges
+
+    GitHub raw and jsDelivr pick their own compression and caching, so
+    the site fetches this one stable ``gs_citations.json``. Returns its
+    path.
+    """
+    data = json.dumps(
+        {"citedby": citedby, "num_citations": counts},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    ).encode()
+    path = os.path.join(results_dir, f"{PAYLOAD_NAME}.json")
+    write_atomic(path, data)
+    return path
+
+
+def bake_site_data(results_dir: str, path: str) -> bool:
+    """Copy the payload into the site's Jekyll data file at ``path``
+
+    Liquid renders the counts into the pages at build time, so they show
+    without any request. ``updated`` (ISO 8601, UTC) only moves when the
+    counts change; ``checked`` moves with every crawl that confirmed them,
+    but unchanged counts are left byte for byte as they were until their
+    ``checked`` is ``CHECKED_EVERY`` old. Returns whether the file changed.
+    """
+    try:
+        with open(os.path.join(results_dir, f"{PAYLOAD_NAME}.json"), "r") as infile:
+            payload = json.load(infile)
+    except (OSError, ValueError):
+        return False
+    try:
+        with open(path, "r") as infile:
+            previous = json.load(infile)
+    except (OSError, ValueError):
+        previous = {}
+    now = datetime.now(timezone.utc)
+    if all(previous.get(key) == payload[key] for key in ("citedby", "num_citations")):
+        try:
+            checked = datetime.fromisoformat(previous["checked"])
+        except (KeyError, TypeError, ValueError):
+            checked = None
+        if checked is not None and now - checked < CHECKED_EVERY:
+            return False
+        payload = previous
+    else:
+        payload["updated"] = now.isoformat(timespec="seconds")
+    payload["checked"] = now.isoformat(timespec="seconds")
+    data = json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    write_atomic(path, data.encode())
+    return True
@@ -0,0 +1,207 @@
+"""Pool of egress proxies for Google Scholar, routed by their health"""
+
+import random
+import threading
+import time
+from http.cookiejar import CookieJar
+from typing import Callable, Dict, Hashable, List, Optional
+from urllib.parse import urlsplit
+
+from metrics import METRICS
+from rate_limiter import RateLimiter
+
+OUTCOMES = ("ok", "error", "captcha")
+
+
+def proxy_label(url: str) -> str:
+    """``host:port`` of a proxy URL, without credentials, for logs and metrics"""
+    parts = urlsplit(url if "://" in url else "http://" + url)
+    return f"{parts.hostname}:{parts.port}" if parts.port else str(parts.hostname)
+
+
+class Proxy:
+    """Health of one egress proxy
+
+    Outcome counts decay exponentially with ``half_life`` seconds, so old
+    failures are forgiven and old successes stop vouching for a proxy
+    that went bad. ``latency`` is a moving average of successful
+    requests. A proxy is ejected after ``eject_after`` failures in a row
+    and comes back on probation when its cooldown ends. ``cookies`` holds
+    the cookies Google Scholar set on requests through this proxy.
+    """
+
+    def __init__(self, url: str, limiter: Optional[RateLimiter] = None):
+        self.url = url
+        self.label = proxy_label(url)
+        self.limiter = limiter
+        self.cookies = CookieJar()
+        self.counts = dict.fromkeys(OUTCOMES, 0.0)
+        self.latency: Optional[float] = None
+        self.updated_at = time.monotonic()
+        self.failures_in_row = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def __getstate__(self):
+        # Cookie jars hold a lock; worker processes start with empty ones
+        state = self.__dict__.copy()
+        del state["cookies"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cookies = CookieJar()
+
+    def decay(self, now: float, half_life: float) -> None:
+        factor = 0.5 ** (max(0.0, now - self.updated_at) / half_life)
+        for outcome in OUTCOMES:
+            self.counts[outcome] *= factor
+        self.updated_at = now
+
+    def score(self, default_latency: float) -> float:
+        """Expected successful requests per second; CAPTCHAs count double"""
+        ok = self.counts["ok"]
+        failed = self.counts["error"] + 2 * self.counts["captcha"]
+        # An imaginary success gives untried proxies the benefit of the doubt
+        success_rate = (ok + 1) / (ok + failed + 1)
+        latency = self.latency if self.latency is not None else default_latency
+        return success_rate / max(latency, 0.01)
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def to_dict(self) -> dict:
+        return {
+            "proxy": self.label,
+            "ok": round(self.counts["ok"], 2),
+            "error": round(self.counts["error"], 2),
+            "captcha": round(self.counts["captcha"], 2),
+            "latency": self.latency,
+            "ejections": self.ejections,
+        }
+
+
+class ProxyPool:
+    """Route requests over several proxies, preferring the healthiest
+
+    Each request goes to the better of two proxies drawn at random
+    ("power of two choices"), which sends most traffic to healthy, fast
+    proxies while still spreading it over all of them. A ``key`` (e.g.
+    the calling thread) sticks to its proxy while that proxy stays
+    available. Each proxy keeps its own cookie jar, so the cookies Google
+    Scholar hands out only ever go back through the IP that received
+    them. Proxies failing ``eject_after`` times in a row are ejected for
+    ``cooldown`` seconds, doubling with every ejection up to
+    ``max_cooldown``. With a ``limiter_factory`` every
+    proxy gets its own rate limiter, so the request rate scales with the
+    number of egress paths (requests in flight stay capped by the host's
+    limiter).
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        half_life: float = 300.0,
+        eject_after: int = 3,
+        cooldown: float = 60.0,
+        max_cooldown: float = 3600.0,
+        limiter_factory: Optional[Callable[[], RateLimiter]] = None,
+        seed: Optional[int] = None,
+    ):
+        if not urls:
+            raise ValueError("A proxy pool needs at least one proxy")
+        self.proxies = [
+            Proxy(url, limiter_factory() if limiter_factory else None)
+            for url in dict.fromkeys(urls)
+        ]
+        self.half_life = half_life
+        self.eject_after = eject_after
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._sticky: Dict[Hashable, Proxy] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def __getstate__(self):
+        # Worker processes get their own copy with a fresh lock
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _default_latency(self) -> float:
+        latencies = [p.latency for p in self.proxies if p.latency is not None]
+        return sum(latencies) / len(latencies) if latencies else 1.0
+
+    def choose(self, key: Optional[Hashable] = None) -> Proxy:
+        """The proxy to send the next request through"""
+        with self._lock:
+            now = time.monotonic()
+            proxy = self._sticky.get(key) if key is not None else None
+            if proxy is not None and proxy.available(now):
+                return proxy
+
+            candidates = [p for p in self.proxies if p.available(now)]
+            if not candidates:
+                # Every proxy is ejected: use the one that comes back first
+                proxy = min(self.proxies, key=lambda p: p.ejected_until)
+            else:
+                default_latency = self._default_latency()
+                for candidate in candidates:
+                    candidate.decay(now, self.half_life)
+                drawn = self._random.sample(candidates, min(2, len(candidates)))
+                proxy = max(drawn, key=lambda p: p.score(default_latency))
+            if key is not None:
+                self._sticky[key] = proxy
+            return proxy
+
+    def record(self, proxy: Proxy, outcome: str, latency: Optional[float] = None) -> None:
+        """Account the ``outcome`` ("ok", "error" or "captcha") of a request"""
+        with self._lock:
+            now = time.monotonic()
+            proxy.decay(now, self.half_life)
+            proxy.counts[outcome] += 1
+            if outcome == "ok":
+                proxy.failures_in_row = 0
+                if latency is not None:
+                    proxy.latency = (
+                        latency if proxy.latency is None else 0.7 * proxy.latency + 0.3 * latency
+                    )
+            else:
+                proxy.failures_in_row += 1
+                if proxy.failures_in_row >= self.eject_after and proxy.available(now):
+                    self._eject(proxy, now)
+        METRICS.inc("scholar_proxy_requests_total", proxy=proxy.label, outcome=outcome)
+
+    def _eject(self, proxy: Proxy, now: float) -> None:
+        cooldown = min(self.max_cooldown, self.cooldown * 2 ** proxy.ejections)
+        proxy.ejections += 1
+        proxy.ejected_until = now + cooldown
+        # On probation once back: a single further failure ejects it again
+        proxy.failures_in_row = self.eject_after - 1
+        for key in [k for k, p in self._sticky.items() if p is proxy]:
+            del self._sticky[key]
+        METRICS.inc("scholar_proxy_ejections_total", proxy=proxy.label)
+        print(f"🚫 Ejected proxy {proxy.label} for {cooldown:.0f} seconds")
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            return [p.to_dict() for p in self.proxies]
+
+
+def read_proxies(spec: Optional[str], path: Optional[str]) -> List[str]:
+    """Proxy URLs from a comma-separated list and a file with one per line"""
+    urls = [url.strip() for url in (spec or "").split(",") if url.strip()]
+    if path:
+        with open(path, "r") as infile:
+            for line in infile:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    urls.append(line)
+    return list(dict.fromkeys(urls))
@@ -0,0 +1,138 @@
+"""Request pacing shared by every crawler worker"""
+
+import json
+import multiprocessing
+import time
+from datetime import datetime
+from typing import Optional
+
+from atomic_file import atomic_open
+from deadline import DeadlineExceeded, current_deadline
+
+
+class RateLimiter:
+    """Adaptive token bucket shared across threads and worker processes
+
+    Tokens refill at ``rate`` requests per second up to ``burst``, and at
+    most ``max_concurrency`` requests are in flight at any time. The rate
+    adapts AIMD-style: every successful request adds ``increase`` to it,
+    every throttling signal (429, 503, CAPTCHA, redirect to a block page)
+    multiplies it by ``decrease`` and pauses all workers for a moment,
+    or as long as Google Scholar asks, up to ``max_pause`` seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.5,
+        max_concurrency: int = 2,
+        min_rate: float = 0.02,
+        max_rate: float = 2.0,
+        increase: float = 0.01,
+        decrease: float = 0.5,
+        burst: float = 1.0,
+        max_pause: float = 300.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.max_pause = max_pause
+        self._lock = multiprocessing.Lock()
+        self._rate = multiprocessing.Value("d", self._clamp(rate), lock=False)
+        self._tokens = multiprocessing.Value("d", burst, lock=False)
+        self._refilled_at = multiprocessing.Value("d", time.time(), lock=False)
+        self._paused_until = multiprocessing.Value("d", 0.0, lock=False)
+        self._in_flight = multiprocessing.BoundedSemaphore(max_concurrency)
+
+    @property
+    def rate(self) -> float:
+        return self._rate.value
+
+    def _clamp(self, rate: float) -> float:
+        return min(self.max_rate, max(self.min_rate, rate))
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._refilled_at.value)
+        self._tokens.value = min(
+            self.burst, self._tokens.value + elapsed * self._rate.value
+        )
+        self._refilled_at.value = now
+
+    def acquire(self, paced: bool = True) -> float:
+        """Block until a request may be sent, return the seconds spent waiting
+
+        With ``paced=False`` only one of the ``max_concurrency`` slots is
+        taken and another limiter paces the request. Waiting stops at the
+        deadline of the calling context, raising ``DeadlineExceeded``
+        without holding a slot.
+        """
+        start = time.time()
+        deadline = current_deadline()
+        timeout = deadline.remaining() if deadline is not None else None
+        if not self._in_flight.acquire(timeout=timeout):
+            raise DeadlineExceeded("Google Scholar crawl ran out of time")
+        if not paced:
+            return time.time() - start
+        try:
+            while True:
+                with self._lock:
+                    now = time.time()
+                    self._refill(now)
+                    if now >= self._paused_until.value and self._tokens.value >= 1:
+                        self._tokens.value -= 1
+                        return time.time() - start
+                    wait = max(
+                        self._paused_until.value - now,
+                        (1 - self._tokens.value) / self._rate.value,
+                    )
+                if deadline is not None:
+                    deadline.check()
+                    wait = min(wait, deadline.remaining())
+                time.sleep(wait)
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+    def release(self) -> None:
+        """Mark an in-flight request as finished"""
+        self._in_flight.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def record_success(self) -> None:
+        """Additive increase after a request went through"""
+        with self._lock:
+            self._rate.value = self._clamp(self._rate.value + self.increase)
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease after Google Scholar pushed back"""
+        with self._lock:
+            now = time.time()
+            self._rate.value = self._clamp(self._rate.value * self.decrease)
+            self._tokens.value = 0.0
+            self._refilled_at.value = now
+            pause = retry_after if retry_after is not None else 1 / self._rate.value
+            pause = min(pause, self.max_pause)
+            self._paused_until.value = max(self._paused_until.value, now + pause)
+
+    def load(self, path: str) -> None:
+        """Start from the rate learned by a previous run, if any"""
+        try:
+            with open(path, "r") as infile:
+                rate = float(json.load(infile)["rate"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        with self._lock:
+            self._rate.value = self._clamp(rate)
+
+    def save(self, path: str) -> None:
+        """Persist the learned rate for the next run"""
+        with atomic_open(path) as outfile:
+            json.dump({"rate": self.rate, "updated": str(datetime.now())}, outfile)
@@ -0,0 +1,208 @@
+"""Delta-encoded history of the full crawler results (``gs_data.json``)"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from atomic_file import write_atomic
+
+INDEX_FILE = "index.json"
+VERSION = 1
+BASE_EVERY = 30  # Deltas after which a new base snapshot is stored
+UPDATED = "updated"  # Kept in the index; it changes on every run
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON patch (RFC 6902) turning ``old`` into ``new``
+
+    Objects are compared key by key; anything else, lists included, is
+    replaced as a whole when it differs.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch = []
+        for key in old:
+            if key not in new:
+                patch.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                patch.append({"op": "add", "path": child, "value": value})
+            else:
+                patch.extend(diff(old[key], value, child))
+        return patch
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Apply the ``add``/``remove``/``replace`` operations of ``diff`` in place"""
+    for operation in patch:
+        if not operation["path"]:
+            document = operation["value"]
+            continue
+        *parents, last = [_unescape(t) for t in operation["path"][1:].split("/")]
+        target = document
+        for token in parents:
+            target = target[token]
+        if operation["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = operation["value"]
+    return document
+
+
+def _digest(state: Dict[str, Any]) -> str:
+    canonical = json.dumps(state, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultsHistory:
+    """Daily states of the crawler results as base snapshots plus deltas
+
+    A directory holds gzipped base snapshots, one JSON patch per later
+    day against the day before, and ``index.json`` listing every day with
+    its file, the base it builds on and a digest of its state. A day is
+    rebuilt from the closest base by applying at most ``BASE_EVERY``
+    deltas; a new base is stored once the chain is that long or the
+    deltas outweigh the base. A run whose results did not change is not
+    written at all.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.entries: List[Dict[str, Any]] = []
+        self._states: Dict[int, Dict[str, Any]] = {}
+        try:
+            with open(os.path.join(directory, INDEX_FILE), "r") as infile:
+                index = json.load(infile)
+        except FileNotFoundError:
+            return
+        if index.get("version") != VERSION:
+            raise ValueError(f"{directory} has an unsupported results history version")
+        self.entries = index["entries"]
+
+    @property
+    def dates(self) -> List[date]:
+        return [date.fromisoformat(entry["date"]) for entry in self.entries]
+
+    def _read(self, file_name: str) -> Any:
+        path = os.path.join(self.directory, file_name)
+        opener = gzip.open if file_name.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as infile:
+            return json.load(infile)
+
+    def _write(self, file_name: str, data: Any) -> int:
+        """Atomically write ``data``; returns the bytes written"""
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        raw = text.encode("utf-8")
+        if file_name.endswith(".gz"):
+            raw = gzip.compress(raw, 9, mtime=0)
+        return write_atomic(os.path.join(self.directory, file_name), raw)
+
+    def _state_at(self, row: int) -> Dict[str, Any]:
+        """State of entry ``row``, without the ``updated`` timestamp"""
+        if row not in self._states:
+            base_row = self.entries[row]["base"]
+            state = self._read(self.entries[base_row]["file"])
+            for delta_row in range(base_row + 1, row + 1):
+                state = apply_patch(state, self._read(self.entries[delta_row]["file"]))
+            # Keep only the latest state; it is the one the next record diffs against
+            self._states = {row: state}
+        return json.loads(json.dumps(self._states[row]))
+
+    def state(self, day: Optional[date] = None) -> Dict[str, Any]:
+        """Results as of ``day`` (latest by default)"""
+        row = len(self.entries) - 1
+        if day is not None:
+            row = bisect_right(self.dates, day) - 1
+        if row < 0:
+            raise KeyError(f"No results on or before {day}")
+        state = self._state_at(row)
+        state[UPDATED] = self.entries[row][UPDATED]
+        return state
+
+    def record(self, day: date, results: Dict[str, Any]) -> bool:
+        """Store the results of ``day``, replacing any already stored that day
+
+        Returns False, without writing anything, when they equal the
+        previous day's.
+        """
+        state = json.loads(json.dumps({k: v for k, v in results.items() if k != UPDATED}))
+        digest = _digest(state)
+        entries = list(self.entries)
+        if entries and date.fromisoformat(entries[-1]["date"]) > day:
+            raise ValueError(f"Results of {day} are older than the last stored ones")
+        if entries and entries[-1]["date"] == day.isoformat():
+            if entries[-1]["sha256"] == digest:
+                return False
+            replaced = entries.pop()
+        else:
+            replaced = None
+            if entries and entries[-1]["sha256"] == digest:
+                return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"date": day.isoformat(), UPDATED: results.get(UPDATED), "sha256": digest}
+        base_row = entries[-1]["base"] if entries else None
+        chain = entries[base_row + 1 :] if base_row is not None else []
+        base_size = entries[base_row]["size"] if base_row is not None else 0
+        if base_row is None or len(chain) >= BASE_EVERY or sum(e["size"] for e in chain) > base_size:
+            entry.update(file=f"base-{day.isoformat()}.json.gz", base=len(entries))
+            entry["size"] = self._write(entry["file"], state)
+        else:
+            patch = diff(self._state_at(len(entries) - 1), state)
+            entry.update(file=f"delta-{day.isoformat()}.json", base=base_row)
+            entry["size"] = self._write(entry["file"], patch)
+        if replaced is not None and replaced["file"] != entry["file"]:
+            os.remove(os.path.join(self.directory, replaced["file"]))
+
+        entries.append(entry)
+        self._write(INDEX_FILE, {"version": VERSION, "entries": entries})
+        self.entries = entries
+        self._states = {len(entries) - 1: state}
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the crawler results of a past day")
+    parser.add_argument("directory", nargs="?", default=os.path.join("results", "gs_data_history"))
+    parser.add_argument("--date", type=date.fromisoformat, help="Day to rebuild (default: latest)")
+    parser.add_argument("--output", help="Write the rebuilt gs_data.json here")
+    args = parser.parse_args(argv)
+
+    history = ResultsHistory(args.directory)
+    if not history.entries:
+        print(f"No results in {args.directory}")
+        return
+    bases = sum(1 for row, entry in enumerate(history.entries) if entry["base"] == row)
+    size = sum(entry["size"] for entry in history.entries)
+    print(
+        f"📅 {len(history.entries)} days from {history.entries[0]['date']} to "
+        f"{history.entries[-1]['date']}: {bases} base snapshots, {size / 1024:.1f} KB"
+    )
+    state = history.state(args.date)
+    print(
+        f"📈 As of {state[UPDATED]}: {state.get('citedby', 'N/A')} citations, "
+        f"{len(state.get('publications', {}))} publications"
+    )
+    if args.output:
+        with open(args.output, "w") as outfile:
+            json.dump(state, outfile, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
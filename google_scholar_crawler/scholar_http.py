@@ -0,0 +1,254 @@
+"""Hooks into the HTTP sessions scholarly uses to talk to Google Scholar"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+from requests.cookies import extract_cookies_to_jar, get_cookie_header
+from scholarly import ProxyGenerator
+from scholarly._navigator import Navigator
+
+from deadline import current_deadline
+from http_cache import ResponseCache
+from metrics import METRICS
+from proxy_pool import ProxyPool
+from rate_limiter import RateLimiter
+
+SCHOLAR_HOST = "scholar.google.com"
+
+# Markers scholarly itself uses to recognise CAPTCHA and DoS pages
+_BLOCKED_MARKERS = (
+    'id="gs_captcha_ccl"',
+    'id="recaptcha"',
+    'id="captcha-form"',
+    'class="rc-doscaptcha-body"',
+)
+
+
+# Google sends clients it considers abusive to these pages
+_BLOCK_PAGES = ("/sorry/", "accounts.google.com")
+
+
+def looks_blocked(response) -> bool:
+    """Whether Google Scholar answered with a CAPTCHA instead of the page"""
+    text = response.text
+    return any(marker in text for marker in _BLOCKED_MARKERS)
+
+
+def is_throttled(response) -> bool:
+    """Whether a response signals that requests should slow down"""
+    if response.status_code in (429, 503):
+        return True
+    if response.is_redirect:
+        location = response.headers.get("Location", "")
+        return any(page in location for page in _BLOCK_PAGES)
+    if any(page in response.url for page in _BLOCK_PAGES):
+        return True
+    return response.status_code == 200 and looks_blocked(response)
+
+
+def page_kind(url: str) -> str:
+    """Coarse page type used to label request metrics"""
+    if "view_op=view_citation" in url:
+        return "publication"
+    if "/citations?" in url:
+        return "profile"
+    return "other"
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header, if given as a number"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class ScholarAdapter(HTTPAdapter):
+    """Transport adapter that paces every request sent to Google Scholar
+
+    Responses feed back into the host's rate limiter, so throttling
+    signals slow every worker down and successes speed them up again.
+    Requests are refused once the active crawl deadline has passed, and
+    their timeout is shortened so that none of them outlives it. With a
+    ``cache``, fresh pages are replayed from disk without touching the
+    network and stale ones are revalidated with conditional requests.
+    With an ``origin`` such as ``http://127.0.0.1:8000``, requests for
+    Google Scholar are sent there instead (e.g. to the benchmark's mock
+    server); pacing and caching still use the original URL. With
+    ``proxies``, every Google Scholar request leaves through a proxy of
+    the pool, paced by that proxy's own limiter if it has one (the host's
+    limiter still caps requests in flight), and its outcome feeds the
+    proxy's health. scholarly shares one session, and so one cookie jar,
+    between all threads; requests through a proxy carry that proxy's
+    cookies instead, so no cookie travels through another IP.
+    """
+
+    def __init__(
+        self,
+        limiters: Optional[Dict[str, RateLimiter]] = None,
+        cache: Optional[ResponseCache] = None,
+        origin: Optional[str] = None,
+        proxies: Optional[ProxyPool] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.limiters = limiters or {}
+        self.cache = cache
+        self.origin = urlsplit(origin) if origin else None
+        self.proxies = proxies
+
+    def send(self, request, **kwargs):
+        kind = page_kind(request.url)
+        start = time.perf_counter()
+        try:
+            response, source = self._send_cached(request, **kwargs)
+        except BaseException as e:
+            METRICS.inc("scholar_request_errors_total", kind=kind, error=type(e).__name__)
+            raise
+        METRICS.observe("scholar_request_seconds", time.perf_counter() - start, kind=kind)
+        METRICS.inc(
+            "scholar_requests_total", kind=kind, status=response.status_code, source=source
+        )
+        if source != "cache":
+            METRICS.inc("scholar_response_bytes_total", len(response.content), kind=kind)
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                METRICS.inc("scholar_retries_total", len(retries.history), kind=kind)
+        return response
+
+    def _send_cached(self, request, **kwargs):
+        """Send ``request`` through the cache, return the response and its source"""
+        if self.cache is None or request.method != "GET":
+            return self._send_paced(request, **kwargs), "network"
+
+        cached = self.cache.get(request.url)
+        if cached is not None:
+            if cached.is_fresh():
+                return cached.to_response(request), "cache"
+            request.headers.update(cached.validators())
+
+        response = self._send_paced(request, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.cache.refresh(request.url)
+            return cached.to_response(request), "revalidated"
+        if response.status_code == 200 and not looks_blocked(response):
+            self.cache.put(request.url, response)
+        return response, "network"
+
+    def _send_paced(self, request, **kwargs):
+        host = urlsplit(request.url).hostname
+        limiter = self.limiters.get(host)
+        pacer = limiter  # Limiter that paces this request and learns from its outcome
+        proxy = None
+        if self.proxies is not None and host == SCHOLAR_HOST:
+            # Threads keep their proxy while it stays healthy
+            proxy = self.proxies.choose(threading.get_ident())
+            kwargs["proxies"] = {"http": proxy.url, "https": proxy.url}
+            request = _with_cookies(request, proxy.cookies)
+            pacer = proxy.limiter or limiter
+        if limiter is None and proxy is None:
+            return self._send_before_deadline(request, **kwargs)
+
+        waited = 0.0
+        if limiter is not None:
+            # Caps the requests in flight over all proxies (--max-per-host)
+            waited += limiter.acquire(paced=pacer is limiter)
+        if pacer is not limiter:
+            try:
+                waited += pacer.acquire()
+            except BaseException:
+                if limiter is not None:
+                    limiter.release()
+                raise
+        start = time.perf_counter()
+        try:
+            response = self._send_before_deadline(request, **kwargs)
+        except Exception:
+            if proxy is not None:
+                self.proxies.record(proxy, "error")
+            raise
+        finally:
+            if pacer is not limiter:
+                pacer.release()
+            if limiter is not None:
+                limiter.release()
+
+        throttled = is_throttled(response)
+        if proxy is not None:
+            if throttled:
+                outcome = "captcha"
+            elif response.status_code >= 500 or response.status_code == 407:
+                outcome = "error"  # Proxy or upstream failure
+            else:
+                outcome = "ok"
+            self.proxies.record(proxy, outcome, time.perf_counter() - start)
+            extract_cookies_to_jar(proxy.cookies, request, response.raw)
+        if pacer is not None:
+            METRICS.observe("scholar_rate_limit_wait_seconds", waited)
+            if throttled:
+                METRICS.inc("scholar_throttled_total")
+                pacer.record_throttle(retry_after(response))
+            else:
+                pacer.record_success()
+        return response
+
+    def _send_before_deadline(self, request, **kwargs):
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+            kwargs["timeout"] = deadline.cap_timeout(kwargs.get("timeout"))
+        if self.origin is not None:
+            url = urlsplit(request.url)
+            if url.hostname == SCHOLAR_HOST:
+                request = request.copy()
+                request.url = urlunsplit(
+                    (self.origin.scheme, self.origin.netloc, url.path, url.query, url.fragment)
+                )
+        return super().send(request, **kwargs)
+
+
+def _with_cookies(request, jar):
+    """Copy of ``request`` carrying the cookies of ``jar`` instead of the session's"""
+    request = request.copy()
+    request.headers.pop("Cookie", None)
+    cookie = get_cookie_header(jar, request)
+    if cookie:
+        request.headers["Cookie"] = cookie
+    return request
+
+
+_adapter: Optional[ScholarAdapter] = None
+_original_new_session = ProxyGenerator._new_session
+
+
+def _mount(session) -> None:
+    if session is not None and _adapter is not None:
+        session.mount("http://", _adapter)
+        session.mount("https://", _adapter)
+
+
+def _new_session(self):
+    session = _original_new_session(self)
+    _mount(session)
+    return session
+
+
+def install_adapter(adapter: ScholarAdapter) -> None:
+    """Route all of scholarly's current and future sessions through ``adapter``
+
+    scholarly creates a fresh ``requests.Session`` whenever it rotates
+    proxies or recovers from a 403, so the adapter is mounted on the
+    existing sessions and on every session created afterwards.
+    """
+    global _adapter
+    _adapter = adapter
+    ProxyGenerator._new_session = _new_session
+
+    nav = Navigator()
+    for pm in (nav.pm1, nav.pm2):
+        _mount(pm.get_session())
+    _mount(nav._session1)
+    _mount(nav._session2)
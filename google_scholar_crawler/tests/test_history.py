@@ -0,0 +1,34 @@
+from datetime import date
+
+from history import CitationHistory
+
+
+def _saved_history(path):
+    history = CitationHistory()
+    history.record(date(2026, 1, 1), 10, {"a:1": 4, "a:2": 6})
+    history.record(date(2026, 1, 2), 12, {"a:1": 5, "a:2": 7})
+    history.save(path)
+    return history
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "citation_history.bin")
+    _saved_history(path)
+    history = CitationHistory.load(path)
+    assert history.dates == [date(2026, 1, 1), date(2026, 1, 2)]
+    assert history.count("a:2") == 7
+
+
+def test_truncated_file_starts_a_new_history(tmp_path):
+    path = tmp_path / "citation_history.bin"
+    _saved_history(str(path))
+    data = path.read_bytes()
+    for length in (3, 12, len(data) - 5):
+        path.write_bytes(data[:length])
+        history = CitationHistory.load(str(path))
+        assert history.dates == []
+        # The crawl's counts can still be saved on top of it
+        history.record(date(2026, 1, 3), 13, {"a:1": 5})
+        history.save(str(path))
+        assert CitationHistory.load(str(path)).dates == [date(2026, 1, 3)]
+        path.write_bytes(data)
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from deadline import Deadline, DeadlineExceeded
+from rate_limiter import RateLimiter
+
+
+def test_retry_after_is_clamped():
+    limiter = RateLimiter(max_pause=300.0)
+    limiter.record_throttle(retry_after=86400)
+    assert limiter._paused_until.value - time.time() <= 300.0
+
+
+def test_long_retry_after_stops_at_the_deadline():
+    limiter = RateLimiter(max_concurrency=1)
+    limiter.record_throttle(retry_after=3600)
+    start = time.monotonic()
+    with Deadline(0.2).activate():
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire()
+    assert time.monotonic() - start < 1.0
+    # The slot was given back: a request without the pause goes through
+    limiter._paused_until.value = 0.0
+    limiter._tokens.value = 1.0
+    limiter.acquire()
+    limiter.release()
+
+
+def test_waiting_for_a_slot_stops_at_the_deadline():
+    limiter = RateLimiter(max_concurrency=1)
+    limiter.acquire(paced=False)
+    start = time.monotonic()
+    with Deadline(0.2).activate():
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire(paced=False)
+    assert time.monotonic() - start < 1.0
+    limiter.release()
@@ -1 +1,4 @@
-bundle exec jekyll liveserve
\ No newline at end of file
+# Re-render resume sections into _pages/about.md whenever resume/resume/*.tex is saved
+python3 scripts/sync_resume.py --watch &
+trap 'kill $! 2>/dev/null' EXIT
+bundle exec jekyll liveserve
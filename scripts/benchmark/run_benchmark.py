@@ -0,0 +1,284 @@
+"""Golden-output check and throughput benchmark for sync_resume
+
+A snapshot of every ``resume/resume/*.tex`` file, kept in
+``benchmark/golden/inputs/``, is rendered (markdown and JSON) and
+compared with the copies in ``benchmark/golden/``, so a change to the
+tokenizer, the parsers or the converter cannot silently change the
+site, while editing the resume never fails the check.
+
+Then the parsers and the converter are timed on the real files and on
+synthetic stress inputs (thousands of ``\\cventry``/``\\item``
+entries, deep brace nesting, long comment runs)::
+
+    python scripts/benchmark/run_benchmark.py
+    python scripts/benchmark/run_benchmark.py --golden-only
+    python scripts/benchmark/run_benchmark.py --update-golden  # snapshot the resume again
+
+Exits with 1 if any rendered output differs from its golden copy.
+"""
+
+import argparse
+import difflib
+import glob
+import json
+import os
+import shutil
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCHMARK_DIR)
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+GOLDEN_DIR = os.path.join(BENCHMARK_DIR, "golden")
+GOLDEN_INPUTS = os.path.join(GOLDEN_DIR, "inputs")  # The sources the golden files were rendered from
+RESUME_SOURCES = os.path.join(REPO_ROOT, "resume", "resume", "*.tex")
+sys.path.insert(0, SCRIPTS_DIR)
+
+from latex_ast import parse, tokenize  # noqa: E402
+from resume_index import detect_parser_type, section_name  # noqa: E402
+from sync_resume import PARSERS, convert_latex_to_markdown, render_json, render_markdown  # noqa: E402
+
+
+def render(name, parser_type, content):
+    """Markdown and JSON renderings of a section's LaTeX ``content``"""
+    parsed_items = PARSERS[parser_type](content)
+    markdown = render_markdown(name, parser_type, parsed_items) + "\n"
+    data = json.dumps(render_json(parsed_items), indent=2, ensure_ascii=False) + "\n"
+    return {f"{name}.md": markdown, f"{name}.json": data}
+
+
+def resume_sections(pattern=RESUME_SOURCES):
+    """``(name, parser_type, content)`` of every resume source file matching ``pattern``"""
+    sections = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        parser_type = detect_parser_type(parse(content))
+        if parser_type is not None:
+            sections.append((section_name(path), parser_type, content))
+    return sections
+
+
+def snapshot_inputs():
+    """Copy the resume sources into ``GOLDEN_INPUTS``, replacing the previous snapshot"""
+    os.makedirs(GOLDEN_INPUTS, exist_ok=True)
+    for path in glob.glob(os.path.join(GOLDEN_INPUTS, "*.tex")):
+        os.remove(path)
+    for path in glob.glob(RESUME_SOURCES):
+        shutil.copyfile(path, os.path.join(GOLDEN_INPUTS, os.path.basename(path)))
+
+
+def check_golden(update=False):
+    """Compare the renderings with the golden files; returns the number of mismatches"""
+    if update:
+        snapshot_inputs()
+    rendered = {}
+    for name, parser_type, content in resume_sections(os.path.join(GOLDEN_INPUTS, "*.tex")):
+        rendered.update(render(name, parser_type, content))
+    if update:
+        for path in glob.glob(os.path.join(GOLDEN_DIR, "*.*")):
+            os.remove(path)
+        for file_name, text in rendered.items():
+            with open(os.path.join(GOLDEN_DIR, file_name), "w", encoding="utf-8") as f:
+                f.write(text)
+        print(f"Updated {len(rendered)} golden files in {GOLDEN_DIR}")
+        return 0
+    if not rendered:
+        print(f"Golden check: no inputs in {GOLDEN_INPUTS}, run with --update-golden")
+        return 1
+
+    mismatches = 0
+    for file_name, text in rendered.items():
+        golden_path = os.path.join(GOLDEN_DIR, file_name)
+        try:
+            with open(golden_path, "r", encoding="utf-8") as f:
+                golden = f.read()
+        except FileNotFoundError:
+            golden = ""
+        if text != golden:
+            mismatches += 1
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    golden.splitlines(True),
+                    text.splitlines(True),
+                    f"golden/{file_name}",
+                    f"rendered/{file_name}",
+                )
+            )
+    stale = set(map(os.path.basename, glob.glob(os.path.join(GOLDEN_DIR, "*.*")))) - set(rendered)
+    for file_name in sorted(stale):
+        mismatches += 1
+        print(f"golden/{file_name} has no source any more")
+    print(f"Golden check: {len(rendered) - mismatches}/{len(rendered)} outputs match")
+    return mismatches
+
+
+# Synthetic stress inputs; "@" is replaced by the entry's number
+
+CVENTRY = r"""
+	\cventry
+	{Team @, \textbf{Some Lab}} % Position
+	{Project @ on \textit{Large Models}} % Title
+	{Chapel Hill} % Location
+	{Sep. 2020 - Present} % Date(s)
+	{
+		\begin{cvitems} % Description(s) bullet points
+			\item {Cut latency by 50\% with \href{https://example.com/@}{\textbf{a cache}} and $O(n^{2})$ math}
+			\item {Wrote ``fast'' kernels \& tools in C/C++ and CUDA, \textit{see} \url{https://example.com}}
+			\item {Served @ requests per second on a cluster}
+		\end{cvitems}
+	}
+"""
+
+PUBLICATION = (
+    r"            \item \textbf{Author @}, Second Author, Third Author$^*$. "
+    r"``Paper @: A Title with \textit{Emphasis},'' \textit{Conference @}, 2025."
+    "\n            \\vspace{1mm}\n"
+)
+
+CVHONOR = "\t\\cvhonor\n\t{Award @} % Award\n\t{Institution @} % Institution\n\t{\\qquad\\ Dec. 2023} % Date\n"
+
+
+def synthetic_cventries(count):
+    body = "".join(CVENTRY.replace("@", str(i)) for i in range(count))
+    return "\\cvsection{Research Experience}\n\\begin{cventries}\n" + body + "\\end{cventries}\n"
+
+
+def synthetic_publications(count):
+    body = "".join(PUBLICATION.replace("@", str(i)) for i in range(count))
+    return (
+        "\\cvsection{Selected Publications}\n\\begin{cventries}\n\\cventry{}{\\ }{\\ }{}{\n"
+        "\\begin{cvitemize2}\n" + body + "\\end{cvitemize2}\n}\n\\end{cventries}\n"
+    )
+
+
+def synthetic_nesting(count, depth):
+    item = "            \\item " + "{" * depth + "\\textbf{Deep} @" + "}" * depth + "\n"
+    body = "".join(item.replace("@", str(i)) for i in range(count))
+    return "\\cvsection{Nested}\n\\begin{cvitemize2}\n" + body + "\\end{cvitemize2}\n"
+
+
+def synthetic_comments(count, run):
+    comments = "".join(f"% commented out line {i} with \\textbf{{markup}} and {{braces\n" for i in range(run))
+    body = "".join(CVHONOR.replace("@", str(i)) + comments for i in range(count))
+    return "\\cvsection{Honors}\n\\begin{cvhonors}\n" + body + "\\end{cvhonors}\n"
+
+
+def stress_sections(scale, depth):
+    return [
+        (f"cventry x{100 * scale}", "research_experience", "cventry", synthetic_cventries(100 * scale)),
+        (f"item x{100 * scale}", "publications", "cvitemize2", synthetic_publications(100 * scale)),
+        (f"nesting {depth}", "publications", "cvitemize2", synthetic_nesting(10 * scale, depth)),
+        (f"comments x{10 * scale}", "awards", "cvhonor", synthetic_comments(10 * scale, 100)),
+    ]
+
+
+def latex_fields(parsed_items):
+    """Every LaTeX string of the parsed records, as the converter sees them"""
+    fields = []
+    for item in parsed_items:
+        for name in item.__slots__:
+            value = getattr(item, name)
+            fields.extend(value if isinstance(value, list) else [value])
+    return fields
+
+
+def timed(function, repeat):
+    """Best and mean wall time of ``function()`` over ``repeat`` runs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times)
+
+
+def benchmark_input(label, name, parser_type, content, repeat):
+    """Time tokenizing, parsing, the section parser, converting and rendering"""
+    megabytes = len(content.encode("utf-8")) / 1e6
+    parser = PARSERS[parser_type]
+    parsed_items = parser(content)
+    fields = latex_fields(parsed_items)
+    # Bypass the memo so every run converts every field
+    convert = convert_latex_to_markdown.__wrapped__
+    field_megabytes = sum(len(field.encode("utf-8")) for field in fields) / 1e6
+
+    def render_uncached():
+        convert_latex_to_markdown.cache_clear()
+        return render_markdown(name, parser_type, parsed_items)
+
+    # (stage, function, entries, megabytes processed)
+    stages = [
+        ("tokenize", lambda: sum(1 for _ in tokenize(content)), len(parsed_items), megabytes),
+        ("parse tree", lambda: parse(content), len(parsed_items), megabytes),
+        (f"parse_{parser_type}", lambda: parser(content), len(parsed_items), megabytes),
+        ("convert", lambda: [convert(field) for field in fields], len(fields), field_megabytes),
+        ("render markdown", render_uncached, len(parsed_items), None),
+    ]
+    results = []
+    for stage, function, entries, size in stages:
+        best, mean = timed(function, repeat)
+        results.append(
+            {
+                "input": label,
+                "stage": stage,
+                "entries": entries,
+                "megabytes": size,
+                "best_seconds": best,
+                "mean_seconds": mean,
+                "entries_per_second": entries / best if best else None,
+                "megabytes_per_second": size / best if best and size else None,
+            }
+        )
+    return results
+
+
+def _fmt(value, spec):
+    return "n/a" if value is None else format(value, spec)
+
+
+def print_table(results):
+    header = f"{'input':>20} {'stage':>18} {'entries':>8} {'best ms':>9} {'mean ms':>9} {'entries/s':>11} {'MB/s':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['input']:>20} {r['stage']:>18} {r['entries']:>8} {r['best_seconds'] * 1000:>9.2f} "
+            f"{r['mean_seconds'] * 1000:>9.2f} {_fmt(r['entries_per_second'], ',.0f'):>11} "
+            f"{_fmt(r['megabytes_per_second'], '.2f'):>7}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Golden-output check and throughput benchmark for sync_resume")
+    parser.add_argument("--golden-only", action="store_true", help="Only compare the outputs with the golden files")
+    parser.add_argument("--update-golden", action="store_true", help="Snapshot the resume and rewrite the golden files from the current code")
+    parser.add_argument("--scale", type=int, default=10, help="Size of the synthetic inputs (x100 entries)")
+    parser.add_argument("--depth", type=int, default=200, help="Brace nesting depth of the nesting input")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mismatches = check_golden(update=args.update_golden)
+    if args.golden_only or args.update_golden:
+        return 1 if mismatches else 0
+
+    inputs = [(name, name, parser_type, content) for name, parser_type, content in resume_sections()]
+    inputs += stress_sections(args.scale, args.depth)
+    results = []
+    for label, name, parser_type, content in inputs:
+        results.extend(benchmark_input(label, name, parser_type, content, args.repeat))
+
+    print()
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as outfile:
+            json.dump({"golden_mismatches": mismatches, "results": results}, outfile, indent=2)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
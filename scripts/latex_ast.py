@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Single-pass LaTeX tokenizer and command/argument tree for the resume sources
+"""
+
+import re
+
+# Tried left to right at every position; each token is consumed exactly once
+TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>%[^\n]*(?:\n[ \t]*)?)         # Comment, its newline and the next line's indent
+  | (?P<command>\\(?:[a-zA-Z@]+\*?|.))        # Control word or control symbol
+  | (?P<math>\$\$.*?\$\$|\$(?:\\.|[^$\\])*\$)  # Inline or display math, kept verbatim
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?P<text>[^%\\${}]+|\$)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Number of mandatory arguments of known commands; unknown commands take
+# every brace group that directly follows them
+ARITY = {
+    "begin": 1,
+    "end": 1,
+    "item": 0,
+    "cvsection": 1,
+    "cventry": 5,
+    "cvhonor": 3,
+    "cvskill": 2,
+    "textbf": 1,
+    "textit": 1,
+    "text": 1,
+    "textcolor": 2,
+    "href": 2,
+    "vspace": 1,
+    "large": 0,
+    "quad": 0,
+    "qquad": 0,
+    "newline": 0,
+    "clearpage": 0,
+}
+
+
+class Text:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Math:
+    """Math (including its ``$`` delimiters), never interpreted"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Group:
+    """Brace group; the root of a document is a group without braces"""
+
+    __slots__ = ("children",)
+
+    def __init__(self):
+        self.children = []
+
+
+class Command:
+    __slots__ = ("name", "args")
+
+    def __init__(self, name):
+        self.name = name
+        self.args = []
+
+    def wants_arg(self):
+        arity = ARITY.get(self.name)
+        return arity is None or len(self.args) < arity
+
+
+class Environment:
+    __slots__ = ("name", "children")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+
+
+def tokenize(text):
+    """Yield ``(kind, value)`` tokens of ``text``, dropping comments"""
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind != "comment":
+            yield kind, match.group()
+
+
+def parse(text):
+    """Parse ``text`` into a tree of groups, commands and environments
+
+    Builds the tree in one linear pass over the tokens. Comments are
+    dropped, brace groups directly after a command (across whitespace and
+    comments) become its arguments, and ``\\begin``/``\\end`` pairs become
+    ``Environment`` nodes. Unbalanced input never raises: stray ``}`` are
+    kept as text and unclosed groups end with the document.
+    """
+    root = Group()
+    # Open containers, each with the command its group is an argument of
+    stack = [(root, None)]
+    pending = None  # Command still accepting arguments
+    space = None  # Whitespace seen while a command was accepting arguments
+
+    def append(node):
+        stack[-1][0].children.append(node)
+
+    for kind, value in tokenize(text):
+        if pending is not None:
+            if kind == "text" and not value.strip():
+                space = (space or "") + value
+                continue
+            if kind != "open":
+                pending = None
+                if space is not None:
+                    append(Text(space))
+            space = None
+
+        if kind == "text":
+            append(Text(value))
+        elif kind == "math":
+            append(Math(value))
+        elif kind == "command":
+            command = Command(value[1:])
+            append(command)
+            if command.wants_arg():
+                pending = command
+        elif kind == "open":
+            group = Group()
+            if pending is not None:
+                pending.args.append(group)
+            else:
+                append(group)
+            stack.append((group, pending))
+            pending = None
+        elif len(stack) == 1:
+            # Unbalanced closing brace
+            append(Text(value))
+        else:
+            _, owner = stack.pop()
+            if owner is None:
+                continue
+            if owner.name in ("begin", "end") and owner.args:
+                _open_or_close(stack, owner)
+            elif owner.wants_arg():
+                pending = owner
+    return root
+
+
+def _open_or_close(stack, command):
+    """Turn a finished ``\\begin``/``\\end`` command into environment structure"""
+    name = to_latex(command.args[0].children).strip()
+    container = stack[-1][0]
+    if command.name == "begin":
+        container.children.pop()
+        environment = Environment(name)
+        container.children.append(environment)
+        stack.append((environment, None))
+        return
+    for depth in range(len(stack) - 1, 0, -1):
+        node = stack[depth][0]
+        if isinstance(node, Environment) and node.name == name:
+            container.children.pop()
+            del stack[depth:]
+            return
+    # Unmatched \end: keep it as a plain command
+
+
+def children_of(node):
+    """Child nodes of ``node``, command arguments included"""
+    if isinstance(node, Command):
+        return node.args
+    if isinstance(node, (Group, Environment)):
+        return node.children
+    return ()
+
+
+def walk(node):
+    """Yield ``node`` and all its descendants in document order"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children_of(node)))
+
+
+def find_commands(node, name):
+    return [n for n in walk(node) if isinstance(n, Command) and n.name == name]
+
+
+def find_environments(node, name):
+    return [n for n in walk(node) if isinstance(n, Environment) and n.name == name]
+
+
+def is_command(node, name):
+    return isinstance(node, Command) and node.name == name
+
+
+def split_items(nodes, name="item"):
+    """Split sibling ``nodes`` at each ``\\item``, dropping what precedes the first"""
+    items = None
+    for node in nodes:
+        if is_command(node, name):
+            if items is None:
+                items = []
+            items.append([])
+        elif items is not None:
+            items[-1].append(node)
+    return items or []
+
+
+def to_latex(nodes):
+    """LaTeX source of ``nodes`` (a node or a list of nodes), without comments"""
+    if not isinstance(nodes, (list, tuple)):
+        nodes = [nodes]
+    parts = []
+    # Nodes still to write and the closing strings between them, next on top;
+    # an explicit stack, so that no nesting depth can exhaust the call stack
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+        elif isinstance(node, (Text, Math)):
+            parts.append(node.value)
+        elif isinstance(node, Command):
+            parts.append("\\" + node.name)
+            for arg in reversed(node.args):
+                stack.append("}")
+                stack.extend(reversed(arg.children))
+                stack.append("{")
+        elif isinstance(node, Environment):
+            parts.append("\\begin{" + node.name + "}")
+            stack.append("\\end{" + node.name + "}")
+            stack.extend(reversed(node.children))
+        else:
+            parts.append("{")
+            stack.append("}")
+            stack.extend(reversed(node.children))
+    return "".join(parts)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Index of the resume's sections, resolved from resume.tex's \\input graph
+"""
+
+import os
+import re
+
+from latex_ast import TOKEN_RE, find_commands, find_environments, parse, to_latex
+
+RESUME_FILE = "resume/resume.tex"
+
+INPUT_COMMANDS = ("\\input", "\\include")
+INPUT_ARG_RE = re.compile(r"\s*\{([^{}]*)\}")
+
+# Sections whose about.md markers predate the index and differ from the
+# name derived from their file
+SECTION_NAME_OVERRIDES = {"awards_and_honors": "awards"}
+
+
+def read_source(path):
+    """Content of a LaTeX file, or None (with an error) if it does not exist"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        print(f"Error: LaTeX file {path} not found")
+        return None
+
+
+def find_inputs(content):
+    """``(start, end, name)`` of every ``\\input``/``\\include`` outside comments"""
+    inputs = []
+    for match in TOKEN_RE.finditer(content):
+        if match.lastgroup == "command" and match.group() in INPUT_COMMANDS:
+            arg = INPUT_ARG_RE.match(content, match.end())
+            if arg:
+                inputs.append((match.start(), arg.end(), arg.group(1).strip()))
+    return inputs
+
+
+def resolve_input(name, base_dir):
+    """Path of an included file; like LaTeX, try ``name.tex`` first"""
+    path = os.path.normpath(os.path.join(base_dir, name))
+    if not path.endswith(".tex") and os.path.exists(path + ".tex"):
+        return path + ".tex"
+    return path
+
+
+def section_name(path):
+    """Section name of a section file, e.g. ``work_experience``"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = re.sub(r"\W+", "_", stem).strip("_").lower()
+    return SECTION_NAME_OVERRIDES.get(name, name)
+
+
+def detect_parser_type(tree):
+    """Parser type of a section from the commands and environments it uses"""
+    # Publications wrap their cvitemize2 list in a \cventry, so look for it first
+    if find_environments(tree, "cvitemize2"):
+        return "cvitemize2"
+    for command in ("cvhonor", "cvskill", "cventry"):
+        if find_commands(tree, command):
+            return command
+    return None
+
+
+class ResumeIndex:
+    """Sections included by the resume and the source files they are built from
+
+    ``sections`` maps each section name to its config (``latex_file``,
+    ``sources``, ``parser_type``, ``title`` and about.md comment markers)
+    in document order, ``contents`` to its source with inputs inlined and
+    ``dependents`` each source file to the sections it invalidates.
+    ``structure`` lists the root and the other files that decide which
+    sections exist.
+    """
+
+    def __init__(self, root_file=RESUME_FILE):
+        self.root_file = os.path.normpath(root_file)
+        # LaTeX resolves every \input against the directory it runs in
+        self.base_dir = os.path.dirname(self.root_file)
+        self.sections = {}
+        self.contents = {}
+        self.dependents = {}
+        self.structure = [self.root_file]
+        content = read_source(self.root_file)
+        if content is not None:
+            self._walk(content, [self.root_file])
+
+    def _walk(self, content, stack):
+        """Find the sections included, directly or not, by a non-section file"""
+        for _, _, name in find_inputs(content):
+            input_path = resolve_input(name, self.base_dir)
+            if input_path in stack:
+                continue  # Include cycle
+            input_content = read_source(input_path)
+            tree = parse(input_content or "")
+            titles = find_commands(tree, "cvsection")
+            if titles:
+                self._add_section(input_path, input_content, tree, titles[0])
+            else:
+                # Missing files too: they may become sections once created
+                self.structure.append(input_path)
+                if input_content is not None:
+                    self._walk(input_content, stack + [input_path])
+
+    def _add_section(self, path, content, tree, title_command):
+        sources = [path]
+        expanded = self._expand(content, sources)
+        if expanded != content:
+            tree = parse(expanded)
+        name = section_name(path)
+        title = to_latex(title_command.args[0].children).strip() if title_command.args else ""
+        self.sections[name] = {
+            "latex_file": path,
+            "sources": sources,
+            "parser_type": detect_parser_type(tree),
+            "title": title,
+            "comment_start": f"<!-- AUTO_{name.upper()}_START -->",
+            "comment_end": f"<!-- AUTO_{name.upper()}_END -->",
+        }
+        self.contents[name] = expanded
+        for source in sources:
+            self.dependents.setdefault(source, []).append(name)
+
+    def _expand(self, content, sources):
+        """``content`` with its inputs inlined; files read are added to ``sources``"""
+        parts = []
+        pos = 0
+        for start, end, name in find_inputs(content):
+            input_path = resolve_input(name, self.base_dir)
+            parts.append(content[pos:start])
+            pos = end
+            if input_path in sources:
+                continue  # Include cycle
+            sources.append(input_path)
+            input_content = read_source(input_path)
+            if input_content is not None:
+                parts.append(self._expand(input_content, sources))
+        parts.append(content[pos:])
+        return "".join(parts)
+
+    def files(self):
+        """Every source file of the resume"""
+        return self.structure + [path for path in self.dependents if path not in self.structure]
+
+    def sections_for(self, paths):
+        """Names of the sections built from any of ``paths``, in document order
+
+        A change to the structure can add or remove sections, so it
+        invalidates all of them.
+        """
+        paths = {os.path.normpath(path) for path in paths}
+        if paths.intersection(self.structure):
+            return list(self.sections)
+        changed = set()
+        for path in paths:
+            changed.update(self.dependents.get(path, ()))
+        return [name for name in self.sections if name in changed]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Typed intermediate model of parsed resume sections
+
+Parsers turn a section's LaTeX into a list of these objects once; every
+renderer (markdown for about.md, JSON) reads the same list. Field values
+are still LaTeX, each renderer converts them for its own target.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import List
+
+
+@dataclass
+class Publication:
+    """An item of a ``cvitemize2`` publication list"""
+
+    __slots__ = ("text",)
+    text: str
+
+
+@dataclass
+class Entry:
+    """A ``\\cventry``; ``items`` are the bullet points of its description"""
+
+    __slots__ = ("position", "title", "location", "date", "items")
+    position: str
+    title: str
+    location: str
+    date: str
+    items: List[str]
+
+
+@dataclass
+class Honor:
+    """A ``\\cvhonor``"""
+
+    __slots__ = ("award_type", "institution", "date")
+    award_type: str
+    institution: str
+    date: str
+
+
+@dataclass
+class Skill:
+    """A ``\\cvskill``"""
+
+    __slots__ = ("category", "skills")
+    category: str
+    skills: str
+
+
+def to_dict(record, convert=None):
+    """Fields of a model object, each string passed through ``convert`` if given"""
+    fields = asdict(record)
+    if convert is None:
+        return fields
+    return {
+        name: [convert(v) for v in value] if isinstance(value, list) else convert(value)
+        for name, value in fields.items()
+    }
@@ -3,270 +3,327 @@
 Script to sync multiple sections from LaTeX resume to Jekyll markdown
 """
 
+import argparse
+import hashlib
+import io
+import json
 import os
+import pickle
 import re
 import sys
-
-# Configuration for different sections
-SECTIONS_CONFIG = {
-    "publications": {
-        "latex_file": "resume/resume/Publications.tex",
-        "comment_start": "<!-- AUTO_PUBLICATIONS_START -->",
-        "comment_end": "<!-- AUTO_PUBLICATIONS_END -->",
-        "parser_type": "cvitemize2",
-    },
-    "education": {
-        "latex_file": "resume/resume/Education.tex",
-        "comment_start": "<!-- AUTO_EDUCATION_START -->",
-        "comment_end": "<!-- AUTO_EDUCATION_END -->",
-        "parser_type": "cventry",
-    },
-    "work_experience": {
-        "latex_file": "resume/resume/Work Experience.tex",
-        "comment_start": "<!-- AUTO_WORK_EXPERIENCE_START -->",
-        "comment_end": "<!-- AUTO_WORK_EXPERIENCE_END -->",
-        "parser_type": "cventry",
-    },
-    "research_experience": {
-        "latex_file": "resume/resume/Research Experience.tex",
-        "comment_start": "<!-- AUTO_RESEARCH_EXPERIENCE_START -->",
-        "comment_end": "<!-- AUTO_RESEARCH_EXPERIENCE_END -->",
-        "parser_type": "cventry",
-    },
-    "awards": {
-        "latex_file": "resume/resume/Awards and Honors.tex",
-        "comment_start": "<!-- AUTO_AWARDS_START -->",
-        "comment_end": "<!-- AUTO_AWARDS_END -->",
-        "parser_type": "cvhonor",
-    },
-}
-
-
-def read_latex_file(latex_file):
-    """Read LaTeX file content"""
-    try:
-        with open(latex_file, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        print(f"Error: LaTeX file {latex_file} not found")
-        return None
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import lru_cache
+
+from latex_ast import (
+    Command,
+    Math,
+    Text,
+    find_commands,
+    find_environments,
+    is_command,
+    parse,
+    split_items,
+    to_latex,
+)
+from resume_index import ResumeIndex
+from resume_model import Entry, Honor, Publication, Skill, to_dict
+from title_index import TitleIndex, load_title_index
+
+ABOUT_FILE = "_pages/about.md"
+
+# Content hashes of the last sync, used to skip sections that did not change
+MANIFEST_FILE = "scripts/.sync_resume_manifest.json"
+
+# Code that renders the sections; any change to it invalidates the manifest
+# and the parse cache
+GENERATOR_FILES = (
+    "sync_resume.py",
+    "latex_ast.py",
+    "resume_model.py",
+    "resume_index.py",
+    "title_index.py",
+)
+
+# Sections, their source files and parser types come from resume.tex's
+# \input graph (see resume_index.py)
+
+# Parsed models of the LaTeX files, one pickle per file (not committed)
+PARSE_CACHE_DIR = "scripts/.sync_resume_cache"
+
+# Google Scholar results whose publications get a citation span in
+# about.md: the crawler's gs_data.json, or a directory of them
+SCHOLAR_DATA = "google_scholar_crawler/results/gs_data.json"
+
+# The ``Title,'' of a publication item
+PUBLICATION_TITLE_RE = re.compile(r"``(.+?),?''", re.DOTALL)
+# A rendered publication linked to its Google Scholar citation count
+CITATION_LINK_RE = re.compile(r"\"(.+?),?\".*\{% include paper_citations\.html id='([^']+)' %\}")
+
+# Publications commented out with "% \item" have always been on the site
+# (the original regex parser matched them); they stay until that is
+# decided on its own, not as a side effect of parsing comments properly
+COMMENTED_ITEM_RE = re.compile(r"^([ \t]*)%[ \t]*(?=\\item\b)", re.MULTILINE)
 
 
 def parse_cvitemize2_section(content):
     """Parse publications section with cvitemize2 format"""
-    # Look for \item statements within the cvitemize2 environment
-    items_pattern = r"\\item\s+(.*?)(?=\\item|\\vspace|\\end\{cvitemize2\})"
-    items = re.findall(items_pattern, content, re.DOTALL)
-
     parsed_items = []
-    for item in items:
-        # Clean up the item text
-        cleaned_item = item.strip()
-        if cleaned_item and not cleaned_item.startswith(
-            "%"
-        ):  # Skip comments and empty items
-            # Remove trailing % symbols and anything after them (LaTeX comments)
-            cleaned_item = re.sub(r"\s*%.*$", "", cleaned_item, flags=re.MULTILINE)
-            parsed_items.append(cleaned_item)
+    content = COMMENTED_ITEM_RE.sub(r"\1", content)
+    for environment in find_environments(parse(content), "cvitemize2"):
+        for item in split_items(environment.children):
+            # \vspace only separates the items
+            cleaned_item = to_latex(
+                [node for node in item if not is_command(node, "vspace")]
+            ).strip()
+            if cleaned_item:  # Skip empty items
+                parsed_items.append(Publication(cleaned_item))
 
     return parsed_items
 
 
 def parse_cventry_section(content):
     """Parse education/experience sections with cventry format"""
-    # Find all \cventry commands
-    cventry_starts = []
-    for match in re.finditer(r"\\cventry\s*", content):
-        cventry_starts.append(match.end())
-
-    entries = []
-    for start_pos in cventry_starts:
-        # Extract 5 parameters from the cventry command
-        params = []
-        pos = start_pos
-
-        for param_num in range(
-            5
-        ):  # Extract 5 parameters: {position}{title}{location}{date}{description}
-            # Skip whitespace, comments, and other characters until we find opening brace
-            while pos < len(content):
-                if content[pos] == "{":
-                    break
-                elif content[pos] == "%":
-                    # Skip comment line
-                    while pos < len(content) and content[pos] != "\n":
-                        pos += 1
-                elif content[pos] in " \t\n":
-                    pos += 1
-                else:
-                    pos += 1  # Skip other characters
-
-            if pos >= len(content) or content[pos] != "{":
-                break  # No more parameters
-
-            # Extract content between matching braces
-            brace_count = 1
-            start_brace = pos + 1
-            pos += 1
-
-            while pos < len(content) and brace_count > 0:
-                if content[pos] == "{":
-                    brace_count += 1
-                elif content[pos] == "}":
-                    brace_count -= 1
-                pos += 1
-
-            if brace_count == 0:
-                param_content = content[start_brace : pos - 1]
-                params.append(param_content)
-            else:
-                break  # Unmatched braces
-
-        if len(params) == 5:
-            entries.append(tuple(params))
-
     parsed_items = []
-    for entry in entries:
-        position, title, location, date, description = entry
+    for command in find_commands(parse(content), "cventry"):
+        if len(command.args) < 5:
+            continue  # Incomplete \cventry
 
-        # Clean up each field
-        position = position.strip()
-        title = title.strip()
-        location = location.strip()
-        date = date.strip()
-        description = description.strip()
+        # 5 parameters: {position}{title}{location}{date}{description}
+        position, title, location, date, description = (
+            to_latex(arg.children).strip() for arg in command.args
+        )
 
         # Skip entries with empty title and description
         if not title and not description:
             continue
 
-        parsed_items.append(
-            {
-                "position": position,
-                "title": title,
-                "location": location,
-                "date": date,
-                "description": description,
-            }
-        )
+        items = parse_description_items(description) if description else []
+        parsed_items.append(Entry(position, title, location, date, items))
 
     return parsed_items
 
 
 def parse_cvhonor_section(content):
     """Parse awards section with cvhonor format"""
-    # Use a more robust approach to handle nested braces
-    # First find all cvhonor lines (excluding comments)
-    lines = content.split("\n")
-    cvhonor_lines = []
-    for line in lines:
-        if line.strip().startswith("\\cvhonor") and not line.strip().startswith("%"):
-            cvhonor_lines.append(line.strip())
-
     parsed_items = []
-    for line in cvhonor_lines:
-        # Extract parameters by finding matching braces
-        params = []
-        i = line.find("{")
-        while i != -1 and len(params) < 3:
-            # Find matching closing brace
-            brace_count = 1
-            j = i + 1
-            while j < len(line) and brace_count > 0:
-                if line[j] == "{":
-                    brace_count += 1
-                elif line[j] == "}":
-                    brace_count -= 1
-                j += 1
-
-            if brace_count == 0:
-                params.append(line[i + 1 : j - 1])
-                # Find next opening brace
-                i = line.find("{", j)
-            else:
-                break
+    for command in find_commands(parse(content), "cvhonor"):
+        if len(command.args) < 3:
+            continue  # Incomplete \cvhonor
+
+        award_type, institution, date = (
+            to_latex(arg.children).strip() for arg in command.args
+        )
 
-        if len(params) == 3:
-            award_type, institution, date = params
+        # Skip empty entries
+        if not award_type:
+            continue
 
-            # Clean up each field
-            award_type = award_type.strip()
-            institution = institution.strip()
-            date = date.strip()
+        parsed_items.append(Honor(award_type, institution, date))
 
-            # Skip empty entries
-            if not award_type.strip():
-                continue
+    return parsed_items
 
-            parsed_items.append(
-                {"award_type": award_type, "institution": institution, "date": date}
-            )
+
+def parse_cvskill_section(content):
+    """Parse skills section with cvskill format"""
+    parsed_items = []
+    for command in find_commands(parse(content), "cvskill"):
+        if len(command.args) < 2:
+            continue  # Incomplete \cvskill
+
+        category, skills = (to_latex(arg.children).strip() for arg in command.args)
+        if category or skills:
+            parsed_items.append(Skill(category, skills))
 
     return parsed_items
 
 
+def parse_description_items(description):
+    """Bullet points of the cvitems environments in a cventry description"""
+    return [
+        to_latex(item).strip()
+        for environment in find_environments(parse(description), "cvitems")
+        for item in split_items(environment.children)
+    ]
+
+
+# Markdown for LaTeX commands: a template over the converted arguments and
+# the indexes of arguments that are used verbatim (URLs). Commands not
+# listed here are replaced by their converted arguments.
+MARKDOWN_COMMANDS = {
+    "textbf": ("**{0}**", ()),
+    "textit": ("_{0}_", ()),
+    "emph": ("_{0}_", ()),
+    "href": ("[{1}]({0})", (0,)),
+    "url": ("[{0}]({0})", (0,)),
+    "textcolor": ("{1}", ()),  # Drop color formatting
+    "vspace": ("", ()),
+    "hspace": ("", ()),
+    "quad": ("", ()),
+    "qquad": ("", ()),
+    "item": ("", ()),
+    "LaTeX": ("LaTeX", ()),
+    "TeX": ("TeX", ()),
+    "newline": (" ", ()),
+    "\\": (" ", ()),
+    " ": (" ", ()),
+    ",": (" ", ()),
+    "-": ("", ()),
+    "&": ("&", ()),
+    "%": ("%", ()),
+    "#": ("#", ()),
+    "_": ("\\_", ()),  # Keep underscores from starting markdown emphasis
+    "$": ("\\$", ()),
+}
+
+# Characters whose escapes are dropped in verbatim arguments
+VERBATIM_ESCAPE_RE = re.compile(r"\\([_%#&$])")
+
+
+def _verbatim(group):
+    return VERBATIM_ESCAPE_RE.sub(r"\1", to_latex(group.children).strip())
+
+
+class _Siblings:
+    """Sibling nodes being converted, with the markdown produced so far"""
+
+    __slots__ = ("nodes", "index", "parts", "eat_space")
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.index = 0
+        self.parts = []
+        self.eat_space = False  # TeX ignores spaces after a control word
+
+
+class _Arguments:
+    """Command whose arguments are being converted"""
+
+    __slots__ = ("command", "args")
+
+    def __init__(self, command):
+        self.command = command
+        self.args = []
+
+
+def _command_to_markdown(command, args):
+    template, _ = MARKDOWN_COMMANDS.get(command.name, (None, ()))
+    if template is None:
+        # Unknown control words vanish, unknown control symbols stay
+        return "".join(args) if command.args or command.name[:1].isalpha() else command.name
+    return template.format(*args, *[""] * 3)
+
+
+def _nodes_to_markdown(nodes):
+    """Markdown of sibling ``nodes``, converted in one walk over the tree
+
+    The walk keeps an explicit stack of the sibling lists and command
+    arguments being converted, so that no nesting depth can exhaust the
+    call stack.
+    """
+    stack = [_Siblings(nodes)]
+    result = None  # Markdown of the sibling list just finished
+    while True:
+        frame = stack[-1]
+        if type(frame) is _Arguments:
+            command = frame.command
+            args = frame.args
+            if result is not None:
+                args.append(result)
+                result = None
+            verbatim = MARKDOWN_COMMANDS.get(command.name, (None, ()))[1]
+            while len(args) < len(command.args) and len(args) in verbatim:
+                args.append(_verbatim(command.args[len(args)]))
+            if len(args) < len(command.args):
+                stack.append(_Siblings(command.args[len(args)].children))
+                continue
+            stack.pop()
+            parent = stack[-1]
+            parent.parts.append(_command_to_markdown(command, args))
+            parent.eat_space = command.name[:1].isalpha() and not command.args
+            continue
+
+        parts = frame.parts
+        eat_space = frame.eat_space
+        if result is not None:
+            # Bare groups and environments only contribute their content
+            parts.append(result)
+            eat_space = False
+            result = None
+        nodes = frame.nodes
+        index = frame.index
+        while index < len(nodes):
+            node = nodes[index]
+            index += 1
+            kind = type(node)
+            if kind is Text:
+                text = node.value.lstrip() if eat_space else node.value
+                # LaTeX quotes ``...'' become plain double quotes
+                parts.append(text.replace("``", '"').replace("''", '"'))
+                eat_space = False
+            elif kind is Math:
+                # Keep math as is for the site's math rendering
+                parts.append(node.value)
+                eat_space = False
+            elif kind is Command and not node.args:
+                parts.append(_command_to_markdown(node, []))
+                eat_space = node.name[:1].isalpha()
+            else:
+                frame.index = index
+                frame.eat_space = eat_space
+                stack.append(
+                    _Arguments(node) if kind is Command else _Siblings(node.children)
+                )
+                break
+        else:
+            stack.pop()
+            result = "".join(parts)
+            if not stack:
+                return result
+
+
+@lru_cache(maxsize=None)
 def convert_latex_to_markdown(latex_text):
     """Convert LaTeX formatting to markdown"""
-    text = latex_text
+    text = _nodes_to_markdown(parse(latex_text).children)
 
-    # Convert textbf to markdown bold
-    text = re.sub(r"\\textbf\{([^}]+)\}", r"**\1**", text)
+    # Clean up whitespace
+    return re.sub(r"\s+", " ", text).strip()
 
-    # Convert textit to markdown italic for conference names using underscores
-    text = re.sub(r"\\textit\{([^}]+)\}", r"_\1_", text)
 
-    # Convert href to markdown links
-    text = re.sub(
-        r"\\href\{([^}]+)\}\{\\textcolor\{link\}\{([^}]+)\}\}", r"[\2](\1)", text
-    )
+def publication_title(text):
+    """Title of a publication: the ``quoted'' part, or all of it"""
+    match = PUBLICATION_TITLE_RE.search(text)
+    return match.group(1) if match else text
 
-    # Convert textcolor to simple text (removing color formatting)
-    text = re.sub(r"\\textcolor\{[^}]+\}\{([^}]+)\}", r"\1", text)
-
-    # Handle LaTeX quotes - convert to proper double quotes
-    # Use non-greedy matching and handle quotes that may contain apostrophes
-    text = re.sub(r"``(.*?)\'\'", r'"\1"', text)
-
-    # Preserve LaTeX math for superscripts (keep $ signs for proper rendering)
-    # Don't convert these - keep them as LaTeX for proper markdown math rendering
-    # text = re.sub(r"\$\^\\text\{([^}]+)\}\$", r"$^\{\\text\{\1\}\}$", text)
-
-    # Handle specific LaTeX math superscripts that need to be preserved
-    text = re.sub(r"\$\^\\text\{([^}]+)\}\$", r"$^\\text{\1}$", text)
-    # Keep other math expressions intact
-    # text = re.sub(r"\$\^([^$]+)\$", r"$^\1$", text)
-
-    # Remove LaTeX commands that don't have direct markdown equivalents
-    text = re.sub(r"\\vspace\{[^}]+\}", "", text)
-    text = re.sub(r"\\qquad\\?", "", text)
-    text = re.sub(r"\\text\{([^}]+)\}", r"\\text{\1}", text)  # Keep \text for math mode
-
-    # Remove remaining LaTeX commands but preserve math expressions
-    # Don't remove content within $ signs
-    parts = re.split(r"(\$[^$]*\$)", text)
-    for i in range(0, len(parts), 2):  # Process non-math parts only
-        # Remove LaTeX commands but keep their content if meaningful
-        parts[i] = re.sub(r"\\([a-zA-Z]+)\{([^}]*)\}", r"\2", parts[i])
-        parts[i] = re.sub(
-            r"\\([a-zA-Z]+)\s*", "", parts[i]
-        )  # Remove commands without parameters
-        # Clean up remaining LaTeX artifacts from non-math parts only
-        parts[i] = parts[i].replace("{", "").replace("}", "")
-
-    text = "".join(parts)
 
-    # Clean up whitespace
-    text = re.sub(r"\s+", " ", text)
-    text = text.strip()
+def linked_titles(block):
+    """Index of the publications a rendered block links to Google Scholar
 
-    return text
+    Stands in for the crawler results when they are not available, so
+    that the citation counts already in about.md stay. Returns None if
+    the block has no links.
+    """
+    index = TitleIndex()
+    for title, pub_id in CITATION_LINK_RE.findall(block):
+        index.add(pub_id, title)
+    return index if len(index) else None
 
 
-def generate_publications_markdown(publications):
-    """Generate markdown for publications list"""
+def generate_publications_markdown(publications, title_index=None):
+    """Generate markdown for publications list
+
+    With a ``title_index`` of the Google Scholar publications, each
+    publication found there shows its citation count (see
+    ``_includes/paper_citations.html``).
+    """
     markdown_lines = []
     for pub in publications:
-        converted_pub = convert_latex_to_markdown(pub)
+        converted_pub = convert_latex_to_markdown(pub.text)
+        match = title_index.match(publication_title(pub.text)) if title_index else None
+        if match:
+            converted_pub += f" {{% include paper_citations.html id='{match[0]}' %}}"
         markdown_lines.append(f"- {converted_pub}")
     return "\n".join(markdown_lines)
 
@@ -276,10 +333,10 @@ def generate_education_markdown(education_entries):
     markdown_lines = []
 
     for entry in education_entries:
-        date = entry["date"]
-        title = convert_latex_to_markdown(entry["title"])
-        location = convert_latex_to_markdown(entry["location"])
-        institution = convert_latex_to_markdown(entry["position"])
+        date = entry.date
+        title = convert_latex_to_markdown(entry.title)
+        location = convert_latex_to_markdown(entry.location)
+        institution = convert_latex_to_markdown(entry.position)
         # Skip description for education - only show date, degree, institution, location
 
         # Format: - date, title, institution, location (no description, no italic date)
@@ -304,11 +361,9 @@ def generate_experience_markdown(experience_entries, experience_type="experience
     markdown_lines = []
 
     for entry in experience_entries:
-        date = entry["date"]
-        title = convert_latex_to_markdown(entry["title"])
-        location = convert_latex_to_markdown(entry["location"])
-        position = convert_latex_to_markdown(entry["position"])
-        description = entry["description"] if entry["description"] else ""
+        date = entry.date
+        title = convert_latex_to_markdown(entry.title)
+        location = convert_latex_to_markdown(entry.location)
 
         # Create entry header
         header_parts = []
@@ -322,18 +377,12 @@ def generate_experience_markdown(experience_entries, experience_type="experience
         if header_parts:
             markdown_lines.append(f"- {' - '.join(header_parts)}")
 
-            # Add description if available
-            if description:
-                # Parse bullet points from description
-                # Look for \item statements within cvitems environment
-                item_pattern = r"\\item\s+(.*?)(?=\s*\\item|\s*\\end|$)"
-                items = re.findall(item_pattern, description, re.DOTALL)
-
-                for item in items:
-                    # Convert LaTeX formatting to markdown for each item
-                    item_clean = convert_latex_to_markdown(item.strip())
-                    if item_clean:
-                        markdown_lines.append(f"  - {item_clean}")
+            # Add the description's bullet points, if any
+            for item in entry.items:
+                # Convert LaTeX formatting to markdown for each item
+                item_clean = convert_latex_to_markdown(item)
+                if item_clean:
+                    markdown_lines.append(f"  - {item_clean}")
 
             markdown_lines.append("")  # Add blank line between entries
 
@@ -345,9 +394,9 @@ def generate_awards_markdown(awards_entries):
     markdown_lines = []
 
     for entry in awards_entries:
-        award_type = convert_latex_to_markdown(entry["award_type"])
-        institution = convert_latex_to_markdown(entry["institution"])
-        date = entry["date"].replace("\\qquad\\", "").strip()
+        award_type = convert_latex_to_markdown(entry.award_type)
+        institution = convert_latex_to_markdown(entry.institution)
+        date = entry.date.replace("\\qquad\\", "").strip()
 
         # Extract date in readable format
         date_match = re.search(r"([A-Z][a-z]{2}\.\s*\d{4})", date)
@@ -372,154 +421,384 @@ def generate_awards_markdown(awards_entries):
     return "\n".join(markdown_lines)
 
 
-def update_about_md_section(section_name, markdown_content):
-    """Update a specific section in about.md using special comments"""
-    about_file = "_pages/about.md"
-    config = SECTIONS_CONFIG[section_name]
-
-    try:
-        with open(about_file, "r", encoding="utf-8") as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"Error: {about_file} not found")
-        return False
-
-    # Find the special comment boundaries
-    start_pattern = re.escape(config["comment_start"])
-    end_pattern = re.escape(config["comment_end"])
+def generate_skills_markdown(skills):
+    """Generate markdown for skills section"""
+    markdown_lines = []
+    for skill in skills:
+        category = convert_latex_to_markdown(skill.category)
+        skillset = convert_latex_to_markdown(skill.skills)
+        markdown_lines.append(f"- **{category}**: {skillset}" if category else f"- {skillset}")
+    return "\n".join(markdown_lines)
 
-    start_match = re.search(start_pattern, content)
-    end_match = re.search(end_pattern, content)
 
-    if not start_match or not end_match:
-        print(f"Error: Could not find {section_name} comment boundaries in about.md")
-        print(
-            f"Please ensure the file contains {config['comment_start']} and {config['comment_end']} comments"
-        )
-        return False
+# Parser of each parser type, returning a list of resume_model objects
+PARSERS = {
+    "cvitemize2": parse_cvitemize2_section,
+    "cventry": parse_cventry_section,
+    "cvhonor": parse_cvhonor_section,
+    "cvskill": parse_cvskill_section,
+}
 
-    # Replace only the content between the comments, preserving the comments themselves
-    before_section = content[: start_match.end()]
-    after_section = content[end_match.start() :]
 
-    # Add the new content with proper spacing
-    new_content = before_section + "\n" + markdown_content + "\n" + after_section
+def render_markdown(section_name, parser_type, parsed_items, title_index=None):
+    """Markdown of a parsed section, as it appears in about.md"""
+    if parser_type == "cvitemize2":
+        return generate_publications_markdown(parsed_items, title_index)
+    if parser_type == "cvhonor":
+        return generate_awards_markdown(parsed_items)
+    if parser_type == "cvskill":
+        return generate_skills_markdown(parsed_items)
+    if section_name == "education":
+        return generate_education_markdown(parsed_items)
+    # work_experience or research_experience
+    return generate_experience_markdown(parsed_items, section_name)
 
-    # Write the updated content
-    try:
-        with open(about_file, "w", encoding="utf-8") as f:
-            f.write(new_content)
-        print(f"Successfully updated {section_name} in about.md")
-        return True
-    except Exception as e:
-        print(f"Error writing to {about_file}: {e}")
-        return False
 
+def render_json(parsed_items):
+    """JSON-ready dicts of a parsed section, LaTeX fields converted to markdown"""
+    return [to_dict(item, convert_latex_to_markdown) for item in parsed_items]
 
-def check_comment_blocks_exist(section_name):
-    """Check if the special comment blocks exist in about.md for the given section"""
-    about_file = "_pages/about.md"
-    config = SECTIONS_CONFIG[section_name]
 
-    try:
-        with open(about_file, "r", encoding="utf-8") as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"Error: {about_file} not found")
-        return False
+def content_hash(text):
+    """SHA-256 of a string"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-    start_comment = config["comment_start"]
-    end_comment = config["comment_end"]
 
-    has_start = start_comment in content
-    has_end = end_comment in content
+@lru_cache(maxsize=None)
+def generator_version():
+    """Hash of the code that parses and renders the sections"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in GENERATOR_FILES:
+        with open(os.path.join(script_dir, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
 
-    if not has_start or not has_end:
-        print(f"Warning: Comment blocks for {section_name} not found in about.md")
-        if not has_start:
-            print(f"  Missing: {start_comment}")
-        if not has_end:
-            print(f"  Missing: {end_comment}")
-        return False
 
-    return True
+def load_manifest():
+    """Load the manifest of the last sync, or an empty one"""
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get("generator") != generator_version():
+        # Rendered with other code: nothing can be skipped
+        manifest = {"generator": generator_version(), "sections": {}}
+    return manifest
+
+
+def _fsync_directory(directory):
+    # Makes the rename itself durable; not every platform can open a directory
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_file_atomic(path, data):
+    """Replace ``path`` with ``data`` (text as UTF-8, or bytes) through a temporary file and a rename
+
+    The data and the rename are on disk before this returns, so an
+    interrupted write leaves the old file in place, never a truncated
+    one. Missing parent directories are created. Mirrors the crawler's
+    ``atomic_file.write_atomic``, as scripts/ is its own import root.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    mode, encoding = ("wb", None) if isinstance(data, bytes) else ("w", "utf-8")
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def parse_section(latex_file, parser_type, content):
+    """Parse a LaTeX file's ``content`` into model objects, through the parse cache
+
+    The cache keeps one pickle per file, valid while the file's content,
+    the parser type and the generator code are the same.
+    """
+    key = content_hash(f"{generator_version()}:{parser_type}:{content}")
+    cache_file = os.path.join(PARSE_CACHE_DIR, os.path.basename(latex_file) + ".pickle")
+    try:
+        with open(cache_file, "rb") as f:
+            cached_key, parsed_items = pickle.load(f)
+        if cached_key == key:
+            return parsed_items
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, pickle.PickleError):
+        pass  # No usable cache entry: parse again
+
+    parsed_items = PARSERS[parser_type](content)
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        write_file_atomic(cache_file, pickle.dumps((key, parsed_items), pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # The cache is only an optimization
+    return parsed_items
 
 
-def sync_section(section_name):
-    """Sync a specific section from LaTeX to markdown"""
-    config = SECTIONS_CONFIG[section_name]
+def save_manifest(manifest):
+    """Write the manifest if it changed"""
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return
+    except OSError:
+        pass
+    write_file_atomic(MANIFEST_FILE, text)
+
+
+def find_section_blocks(content, sections):
+    """Map each section with both markers to the span between them
+
+    Every section's markers are found together in a single scan.
+    """
+    markers = {
+        config[key]: (section_name, kind)
+        for section_name, config in sections.items()
+        for key, kind in (("comment_start", "start"), ("comment_end", "end"))
+    }
+    markers_re = re.compile("|".join(re.escape(marker) for marker in markers))
+    starts = {}
+    blocks = {}
+    for match in markers_re.finditer(content):
+        section_name, kind = markers[match.group()]
+        if kind == "start":
+            starts.setdefault(section_name, match.end())
+        elif section_name in starts and section_name not in blocks:
+            blocks[section_name] = (starts[section_name], match.start())
+    return blocks
+
+
+def report_missing_markers(section_name, config, content):
+    """Explain which comment markers of a section are missing from about.md"""
+    print(f"Warning: Comment blocks for {section_name} not found in about.md")
+    for marker in (config["comment_start"], config["comment_end"]):
+        if marker not in content:
+            print(f"  Missing: {marker}")
+
+
+def splice_blocks(content, blocks, replacements):
+    """Return ``content`` with the blocks of the replaced sections swapped in"""
+    parts = []
+    pos = 0
+    for section_name, (start, end) in sorted(blocks.items(), key=lambda item: item[1]):
+        if section_name in replacements and start >= pos:
+            parts.append(content[pos:start])
+            parts.append(replacements[section_name])
+            pos = end
+    parts.append(content[pos:])
+    return "".join(parts)
+
+
+def sync_section(section_name, config, content, current_block, recorded, title_index=None):
+    """Render a section from LaTeX to markdown
+
+    ``content`` is the section's source with its inputs inlined. Returns
+    the text that belongs between the section's comment markers
+    (``current_block`` if nothing changed) and the section's manifest
+    entry, or ``(None, None)`` if the section failed. ``recorded`` is the
+    entry of the last sync. Publications are linked to their citation
+    counts through ``title_index``; without one they keep the links
+    ``current_block`` already has.
+    """
     latex_file = config["latex_file"]
     parser_type = config["parser_type"]
-
-    print(f"Reading {section_name} from {latex_file}")
-
-    # Read LaTeX file
-    content = read_latex_file(latex_file)
-    if content is None:
-        return False
-
-    # Parse based on section type
-    if parser_type == "cvitemize2":
-        parsed_items = parse_cvitemize2_section(content)
-        markdown_content = generate_publications_markdown(parsed_items)
-    elif parser_type == "cventry":
-        parsed_items = parse_cventry_section(content)
-        if section_name == "education":
-            markdown_content = generate_education_markdown(parsed_items)
-        else:  # work_experience or research_experience
-            markdown_content = generate_experience_markdown(parsed_items, section_name)
-    elif parser_type == "cvhonor":
-        parsed_items = parse_cvhonor_section(content)
-        markdown_content = generate_awards_markdown(parsed_items)
+    scholar = None  # Fingerprint of the Scholar publications linked to
+    relinked = False
+    if parser_type != "cvitemize2":
+        title_index = None
+    elif title_index is not None:
+        scholar = title_index.fingerprint()
     else:
+        # The links in about.md are as current as when they were made
+        scholar = recorded.get("scholar") if recorded else None
+        title_index = linked_titles(current_block)
+        relinked = True
+
+    print(f"Reading {section_name} from {', '.join(config['sources'])}")
+
+    # Skip the section if neither its source nor its block in about.md
+    # changed, nor the Scholar publications it links to
+    source_hash = content_hash(content)
+    expected = {"source": source_hash, "rendered": content_hash(current_block)}
+    if scholar is not None:
+        expected["scholar"] = scholar
+    if recorded == expected:
+        print(f"{section_name} is unchanged since the last sync")
+        return current_block, recorded
+
+    if parser_type not in PARSERS:
         print(f"Error: Unknown parser type {parser_type} for section {section_name}")
-        return False
+        return None, None
 
+    parsed_items = parse_section(latex_file, parser_type, content)
     if not parsed_items:
         print(f"No {section_name} entries found in LaTeX file")
-        return False
+        return None, None
 
     print(f"Found {len(parsed_items)} {section_name} entries")
+    markdown_content = render_markdown(section_name, parser_type, parsed_items, title_index)
 
-    # Update about.md
-    return update_about_md_section(section_name, markdown_content)
+    # Keep the comments themselves, with the new content on its own lines
+    block = "\n" + markdown_content + "\n"
+    entry = {"source": source_hash, "rendered": content_hash(block)}
+    if scholar is not None and not relinked:
+        entry["scholar"] = scholar
+    return block, entry
 
 
-def main():
-    """Main function"""
-    # Change to the repository root directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    repo_root = os.path.dirname(script_dir)
-    os.chdir(repo_root)
+def _sync_section_captured(task):
+    """Run sync_section on a tuple of its arguments
 
-    # Get sections to sync from command line arguments
-    import sys
+    The section's console output is returned instead of printed, so that
+    it can be shown in section order however the sections are scheduled.
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        result = sync_section(*task)
+    return result, output.getvalue()
 
-    if len(sys.argv) > 1:
-        sections_to_sync = [arg for arg in sys.argv[1:] if arg in SECTIONS_CONFIG]
-    else:
-        # Default: sync all sections
-        sections_to_sync = list(SECTIONS_CONFIG.keys())
 
-    print(f"Syncing sections: {', '.join(sections_to_sync)}")
+def sync_sections(tasks, jobs=1):
+    """Run every task, in a pool of ``jobs`` processes if more than one
+
+    Sections are independent, so they can be parsed and rendered in any
+    order; results always come back in task order.
+    """
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            return list(executor.map(_sync_section_captured, tasks))
+    return [_sync_section_captured(task) for task in tasks]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sync sections of the LaTeX resume into _pages/about.md"
+    )
+    parser.add_argument(
+        "sections",
+        nargs="*",
+        help="Sections to sync (default: every section resume.tex includes)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Parse and render sections in this many processes",
+    )
+    parser.add_argument(
+        "--watch",
+        "-w",
+        action="store_true",
+        help="Keep running and re-sync sections whose LaTeX files change",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="FILE",
+        help="Also write the parsed sections as JSON to FILE",
+    )
+    parser.add_argument(
+        "--scholar-data",
+        default=SCHOLAR_DATA,
+        metavar="PATH",
+        help="gs_data.json (or a directory of them) to link publications to citation counts",
+    )
+    return parser.parse_args(argv)
+
+
+def select_sections(index, requested=None):
+    """Names of the ``requested`` sections the index knows (default: all)"""
+    if not requested:
+        return list(index.sections)
+    for section_name in requested:
+        if section_name not in index.sections:
+            print(f"Warning: resume.tex does not include a {section_name} section")
+    return [name for name in index.sections if name in requested]
+
+
+def sync(index, sections_to_sync, jobs=1, title_index=None):
+    """Sync ``sections_to_sync`` of ``index`` into about.md, returning the exit code"""
+    # Read about.md once and locate every section's comment markers
+    try:
+        with open(ABOUT_FILE, "r", encoding="utf-8") as f:
+            about_content = f.read()
+    except FileNotFoundError:
+        print(f"Error: {ABOUT_FILE} not found")
+        return 1
+    blocks = find_section_blocks(about_content, index.sections)
 
     success_count = 0
     skipped_count = 0
     total_count = len(sections_to_sync)
+    manifest = load_manifest()
+    replacements = {}
+
+    # Render every section that has comment blocks, possibly in parallel
+    tasks = []
+    for section_name in sections_to_sync:
+        if section_name in blocks:
+            start, end = blocks[section_name]
+            tasks.append(
+                (
+                    section_name,
+                    index.sections[section_name],
+                    index.contents[section_name],
+                    about_content[start:end],
+                    manifest["sections"].get(section_name),
+                    title_index,
+                )
+            )
+    results = iter(sync_sections(tasks, jobs))
 
     for section_name in sections_to_sync:
         print(f"\n--- Syncing {section_name} ---")
 
         # First check if this section has comment blocks
-        if not check_comment_blocks_exist(section_name):
+        if section_name not in blocks:
+            report_missing_markers(section_name, index.sections[section_name], about_content)
             print(f"Skipped {section_name} - comment blocks not found in about.md")
             skipped_count += 1
             continue
 
-        if sync_section(section_name):
-            success_count += 1
-        else:
+        (block, entry), output = next(results)
+        print(output, end="")
+        if block is None:
             print(f"Failed to sync {section_name}")
+            continue
+        success_count += 1
+        manifest["sections"][section_name] = entry
+        start, end = blocks[section_name]
+        if block != about_content[start:end]:
+            replacements[section_name] = block
+
+    # Write every updated section at once, so about.md is never half-updated
+    if replacements:
+        write_file_atomic(ABOUT_FILE, splice_blocks(about_content, blocks, replacements))
+        print(f"\nSuccessfully updated {', '.join(replacements)} in about.md")
+    else:
+        print("\nabout.md is already up to date")
+    save_manifest(manifest)
 
     attempted_count = total_count - skipped_count
     print("\n=== Summary ===")
@@ -538,5 +817,78 @@ def main():
         return 1
 
 
+def export_json(index, sections_to_sync, output_file):
+    """Write the parsed sections to ``output_file`` as JSON"""
+    data = {}
+    for section_name in sections_to_sync:
+        config = index.sections[section_name]
+        if config["parser_type"] not in PARSERS:
+            continue
+        content = index.contents[section_name]
+        parsed_items = parse_section(config["latex_file"], config["parser_type"], content)
+        data[section_name] = render_json(parsed_items)
+    write_file_atomic(output_file, json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+    print(f"Wrote {', '.join(data)} to {output_file}")
+
+
+def watch_sections(index, requested=None, jobs=1, json_file=None, title_index=None):
+    """Re-sync sections whenever their LaTeX files are saved, until Ctrl+C"""
+    from file_watch import watch
+
+    directories = sorted({os.path.dirname(path) for path in index.files()})
+
+    def on_change(paths):
+        nonlocal index
+        started = time.perf_counter()
+        # The index tells which sections the saved files feed (all of them
+        # if resume.tex changed); rebuild it for the new inputs and content
+        changed = set(index.sections_for(paths))
+        index = ResumeIndex()
+        changed.update(index.sections_for(paths))
+        sections = [name for name in select_sections(index, requested) if name in changed]
+        if sections:
+            sync(index, sections, jobs, title_index)
+            if json_file:
+                export_json(index, select_sections(index, requested), json_file)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"\nRe-synced {', '.join(sections)} in {elapsed_ms:.0f} ms")
+
+    print(f"\nWatching {', '.join(directories)} for changes (Ctrl+C to stop)")
+    try:
+        watch(directories, on_change, suffix=".tex")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return 0
+
+
+def main():
+    """Main function"""
+    # Change to the repository root directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    repo_root = os.path.dirname(script_dir)
+    os.chdir(repo_root)
+
+    args = parse_args()
+    index = ResumeIndex()
+    if not index.sections:
+        print(f"Error: no sections found in {index.root_file}")
+        return 1
+
+    # Default: sync every section resume.tex includes
+    sections_to_sync = select_sections(index, args.sections)
+
+    title_index = load_title_index(args.scholar_data) if os.path.exists(args.scholar_data) else None
+    if title_index is not None:
+        print(f"Linking publications to {len(title_index)} Google Scholar publications")
+
+    print(f"Syncing sections: {', '.join(sections_to_sync)}")
+    exit_code = sync(index, sections_to_sync, args.jobs, title_index)
+    if args.json:
+        export_json(index, sections_to_sync, args.json)
+    if args.watch:
+        return watch_sections(index, args.sections, args.jobs, args.json, title_index)
+    return exit_code
+
+
 if __name__ == "__main__":
     sys.exit(main())